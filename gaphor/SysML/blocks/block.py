@@ -120,10 +120,15 @@ class BlockItem(ElementPresentation[Block], Classified):
                 },
             ),
             *(
-                Text(text=lazy_format(attribute), style={"text-align": TextAlign.LEFT})
+                Text(
+                    text=lazy_format(attribute),
+                    style={"text-align": TextAlign.LEFT},
+                    key=attribute,
+                )
                 for attribute in self.subject.ownedAttribute
                 if predicate(attribute)
             ),
             style={"padding": (4, 4, 4, 4), "min-height": 8},
             draw=draw_top_separator,
+            key=name,
         )
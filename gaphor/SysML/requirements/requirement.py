@@ -109,6 +109,7 @@ class RequirementItem(ElementPresentation[Requirement], Classified):
                         Text(
                             text=lambda: f"Id: {subject.externalId}",
                             style={"text-align": TextAlign.LEFT},
+                            key="id",
                         )
                     ]
                     if subject and subject.externalId
@@ -120,6 +121,7 @@ class RequirementItem(ElementPresentation[Requirement], Classified):
                             text=lambda: f"Text: {subject.text}",
                             width=lambda: self.width - 8,
                             style={"text-align": TextAlign.LEFT},
+                            key="text",
                         )
                     ]
                     if subject and subject.text
@@ -127,6 +129,7 @@ class RequirementItem(ElementPresentation[Requirement], Classified):
                 ),
                 style={"padding": (4, 4, 4, 4), "min-height": 8},
                 draw=draw_top_separator,
+                key="id_and_text",
             )
         else:
-            return Box()
+            return Box(key="id_and_text")
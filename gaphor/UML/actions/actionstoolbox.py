@@ -21,9 +21,7 @@ def activity_config(new_item):
     activities = (
         [i for i in package.ownedClassifier if isinstance(i, UML.Activity)]
         if package
-        else diagram.model.lselect(
-            lambda e: isinstance(e, UML.Activity) and e.package is None
-        )
+        else list(diagram.model.query(UML.Activity, package=None))
     )
     if activities:
         subject.activity = activities[0]
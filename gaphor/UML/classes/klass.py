@@ -189,12 +189,14 @@ def attributes_compartment(subject):
                     if attribute.isStatic
                     else TextDecoration.NONE,
                 },
+                key=attribute,
             )
             for attribute in subject.ownedAttribute
             if not attribute.association
         ),
         style={"padding": (4, 4, 4, 4), "min-height": 8},
         draw=draw_top_separator,
+        key="attributes",
     )
 
 
@@ -217,9 +219,11 @@ def operations_compartment(subject):
                     if operation.isStatic
                     else TextDecoration.NONE,
                 },
+                key=operation,
             )
             for operation in subject.ownedOperation
         ),
         style={"padding": (4, 4, 4, 4), "min-height": 8},
         draw=draw_top_separator,
+        key="operations",
     )
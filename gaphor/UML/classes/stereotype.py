@@ -30,11 +30,16 @@ def _create_stereotype_compartment(appliedStereotype):
                 style={"padding": (0, 0, 4, 0)},
             ),
             *(
-                Text(text=lazy_format(slot), style={"text-align": TextAlign.LEFT})
+                Text(
+                    text=lazy_format(slot),
+                    style={"text-align": TextAlign.LEFT},
+                    key=slot,
+                )
                 for slot in slots
             ),
             style={"padding": (4, 4, 4, 4), "vertical-align": VerticalAlign.TOP},
             draw=draw_top_separator,
+            key=appliedStereotype,
         )
     else:
         return None
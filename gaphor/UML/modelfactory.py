@@ -99,10 +99,10 @@ def apply_stereotype(element, stereotype):
 def find_instances(element):
     """Find instance specification which extend classifier `element`."""
     model = element.model
-    return model.select(
-        lambda e: e.isKindOf(InstanceSpecification)
-        and e.classifier
-        and e.classifier[0] == element
+    return (
+        e
+        for e in model.query(InstanceSpecification, classifier=element)
+        if e.classifier[0] is element
     )
 
 
@@ -135,7 +135,7 @@ def get_stereotypes(element):
     names = {c.__name__ for c in cls.__mro__ if issubclass(c, Element)}
 
     # find stereotypes that extend element class
-    classes = model.select(lambda e: e.isKindOf(Class) and e.name in names)
+    classes = (c for name in names for c in model.query(Class, name=name))
 
     stereotypes = {ext.ownedEnd.type for cls in classes for ext in cls.extension}
     return sorted(stereotypes, key=lambda st: st.name)
@@ -400,3 +400,4 @@ def swap_element(element, new_class):
     """
     if element.__class__ is not new_class:
         element.__class__ = new_class
+        element.model.type_changed(element)
@@ -35,24 +35,28 @@ class StateItem(ElementPresentation[UML.State], VertexItem):
                 and f"entry / {self.subject.entry.name}"
                 or "",
                 style={"text-align": TextAlign.LEFT, "min-height": 0},
+                key="entry",
             ),
             Text(
                 text=lambda: self.subject.exit.name
                 and f"exit / {self.subject.exit.name}"
                 or "",
                 style={"text-align": TextAlign.LEFT, "min-height": 0},
+                key="exit",
             ),
             Text(
                 text=lambda: self.subject.doActivity.name
                 and f"do / {self.subject.doActivity.name}"
                 or "",
                 style={"text-align": TextAlign.LEFT, "min-height": 0},
+                key="do",
             ),
             style={"padding": (4, 4, 4, 4), "vertical-align": VerticalAlign.TOP},
             draw=draw_top_separator,
+            key="behaviors",
         )
         if not any(t.text() for t in compartment.children):
-            compartment = Box()
+            compartment = Box(key="behaviors")
 
         self.shape = Box(
             Box(
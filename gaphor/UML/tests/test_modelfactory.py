@@ -298,3 +298,19 @@ def test_interaction_messages_cloning(element_factory):
 
     assert m2.sendEvent.covered is rl
     assert m2.receiveEvent.covered is sl
+
+
+def test_swap_element(element_factory):
+    fork_node = element_factory.create(UML.ForkNode)
+    join_node = element_factory.create(UML.JoinNode)
+
+    UML.model.swap_element(fork_node, UML.JoinNode)
+
+    assert list(element_factory.select(UML.ForkNode)) == []
+    assert list(element_factory.select(UML.JoinNode)) == [fork_node, join_node]
+    assert list(element_factory.select(UML.ControlNode)) == [fork_node, join_node]
+
+    fork_node.unlink()
+
+    assert list(element_factory.select(UML.JoinNode)) == [join_node]
+    assert fork_node not in element_factory
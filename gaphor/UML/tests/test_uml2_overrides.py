@@ -1,4 +1,6 @@
 from gaphor import UML
+from gaphor.core import event_handler
+from gaphor.core.modeling.event import DerivedAdded, DerivedDeleted, DerivedUpdated
 
 
 def test_qualified_name():
@@ -13,3 +15,40 @@ def test_qualified_name():
     p2.package = p1
 
     assert p3.qualifiedName == ["package1", "package2", "package3"]
+
+
+def test_class_extension(element_factory):
+    metaclass = element_factory.create(UML.Class)
+    stereotype = element_factory.create(UML.Stereotype)
+
+    assert metaclass.extension == []
+
+    extension = UML.model.create_extension(metaclass, stereotype)
+
+    assert metaclass.extension == [extension]
+    assert stereotype.extension == []
+
+
+def test_class_extension_events(event_manager, element_factory):
+    events = []
+
+    @event_handler(DerivedUpdated)
+    def handler(event):
+        if event.property is UML.Class.extension:
+            events.append(event)
+
+    metaclass = element_factory.create(UML.Class)
+    other = element_factory.create(UML.Class)
+    stereotype = element_factory.create(UML.Stereotype)
+    extension = UML.model.create_extension(metaclass, stereotype)
+    event_manager.subscribe(handler)
+
+    end = next(e for e in extension.memberEnd if e is not extension.ownedEnd)
+    end.type = other
+
+    assert metaclass.extension == []
+    assert other.extension == [extension]
+    assert [(type(e), e.element) for e in events] == [
+        (DerivedDeleted, metaclass),
+        (DerivedAdded, other),
+    ]
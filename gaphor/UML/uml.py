@@ -219,7 +219,7 @@ class Class(BehavioredClassifier, EncapsulatedClassifer):
     ownedAttribute: relation_many[Property]
     ownedReception: relation_many[Reception]
     nestedClassifier: relation_many[Classifier]
-    extension: property
+    extension: derived[Extension]
     superClass: derived[Classifier]
 
 
@@ -1492,21 +1492,8 @@ Stereotype.profile = derivedunion("profile", Profile, 1, 1)
 # 64: override Extension.metaclass(Extension.ownedEnd, Association.memberEnd): property
 # defined in umloverrides.py
 
-# 52: override Class.extension(Extension.metaclass): property
-# See https://www.omg.org/spec/UML/2.5/PDF, section 11.8.3.6, page 219
-# It defines `Extension.allInstances()`, which basically means we have to query the element factory.
-
-# TODO: use those as soon as Extension.metaclass can be used.
-# Class.extension = derived('extension', Extension, 0, '*', class_extension, Extension.metaclass)
-
-Class.extension = property(
-    lambda self: self.model.lselect(
-        lambda e: e.isKindOf(Extension) and self is e.metaclass
-    ),
-    doc="""References the Extensions that specify additional properties of the
-metaclass. The property is derived from the extensions whose memberEnds
-are typed by the Class.""",
-)
+# 52: override Class.extension(Extension.metaclass): derived[Extension]
+# defined in umloverrides.py
 
 DirectedRelationship.target = derivedunion(
     "target",
@@ -10,6 +10,7 @@ from __future__ import annotations
 import itertools
 from typing import List, Optional, Union
 
+from gaphor.core.modeling.event import AssociationSet, DerivedAdded, DerivedDeleted
 from gaphor.core.modeling.properties import derived
 from gaphor.UML import uml, umllex
 
@@ -33,6 +34,83 @@ def extension_metaclass(self):
 uml.Extension.metaclass = property(extension_metaclass, doc=extension_metaclass.__doc__)
 
 
+def _end_extension(end: uml.Property) -> Optional[uml.Extension]:
+    """Return the Extension for which ``end`` refers to the metaclass."""
+    extension = end.association
+    if isinstance(extension, uml.Extension) and extension.ownedEnd is not end:
+        return extension
+    return None
+
+
+# See https://www.omg.org/spec/UML/2.5/PDF, section 11.8.3.6, page 219
+def class_extension(self: uml.Class) -> List[Optional[uml.Extension]]:
+    """References the Extensions that specify additional properties of the
+    metaclass.
+
+    The property is derived from the extensions whose memberEnds are
+    typed by the Class.
+    """
+    return [
+        extension
+        for extension in (
+            _end_extension(end) for end in self.model.query(uml.Property, type=self)
+        )
+        if extension
+    ]
+
+
+class classextension(derived[uml.Extension]):
+    """Class.extension.
+
+    The extensions are found through the (indexed) type of their member
+    ends. Changes are emitted on the metaclass when a member end of an
+    extension gets a new type or is added to or removed from an
+    extension.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "extension",
+            uml.Extension,
+            0,
+            "*",
+            class_extension,
+            uml.Property.type,
+            uml.Property.association,
+            uml.Extension.ownedEnd,
+        )
+
+    def propagate(self, event):
+        if event.property not in self.subsets:
+            return
+        # Make sure values are created again
+        self.version += 1
+
+        if not isinstance(event, AssociationSet):
+            return
+
+        if event.property is uml.Property.type:
+            extension = _end_extension(event.element)
+            if extension:
+                self._notify(event.old_value, event.new_value, extension)
+        elif event.property is uml.Property.association:
+            end = event.element
+            old, new = event.old_value, event.new_value
+            if isinstance(old, uml.Extension) and old.ownedEnd is not end:
+                self._notify(end.type, None, old)
+            if isinstance(new, uml.Extension) and new.ownedEnd is not end:
+                self._notify(None, end.type, new)
+
+    def _notify(self, old_metaclass, new_metaclass, extension):
+        if isinstance(old_metaclass, uml.Class):
+            self.handle(DerivedDeleted(old_metaclass, self, extension))
+        if isinstance(new_metaclass, uml.Class):
+            self.handle(DerivedAdded(new_metaclass, self, extension))
+
+
+uml.Class.extension = classextension()
+
+
 def property_opposite(self: uml.Property) -> List[Optional[uml.Property]]:
     """In the case where the property is one navigable end of a binary
     association with both ends navigable, this gives the other end.
@@ -1,6 +1,16 @@
 """1:n and n:m relations in the data model are saved using a collection."""
 
-from typing import Generic, List, Type, TypeVar, Union, overload
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from gaphor.core.modeling.event import AssociationUpdated
 from gaphor.core.modeling.listmixins import querymixin, recursemixin, recurseproxy
@@ -47,16 +57,75 @@ class collectionlist(recursemixin, querymixin, List[T]):  # type: ignore[misc]
 
 
 class collection(Generic[T]):
-    """Collection (set-like) for model elements' 1:n and n:m relationships."""
+    """Collection (set-like) for model elements' 1:n and n:m relationships.
+
+    Items are stored in an (insertion ordered) dictionary, so membership
+    tests, adding and removing items take constant time. The items, as a
+    list, are created when needed and kept until the collection changes.
+    """
 
     def __init__(self, property, object, type: Type[T]):
         self.property = property
         self.object = object
         self.type = type
-        self.items: collectionlist[T] = collectionlist()
+        # Item -> number of occurrences
+        self._items: Dict[T, int] = {}
+        self._size = 0
+        self._list: Optional[collectionlist[T]] = None
+
+    @property
+    def items(self) -> collectionlist[T]:
+        """The items in the collection.
+
+        The list is shared, it should not be modified.
+        """
+        items = self._list
+        if items is None:
+            if self._size == len(self._items):
+                items = collectionlist(self._items)
+            else:
+                items = collectionlist(
+                    item for item, n in self._items.items() for _ in range(n)
+                )
+            self._list = items
+        return items
+
+    @items.setter
+    def items(self, items: Iterable[T]) -> None:
+        self._items = {}
+        self._size = 0
+        self._list = None
+        for item in items:
+            self._add(item)
+
+    def _add(self, value: T) -> None:
+        """Add a value, without notifying the property."""
+        self._items[value] = self._items.get(value, 0) + 1
+        self._size += 1
+        self._list = None
+
+    def _extend(self, values: Iterable[T]) -> None:
+        for value in values:
+            self._add(value)
+
+    def _remove(self, value: T) -> bool:
+        """Remove a value, without notifying the property.
+
+        Returns ``True`` if the value was part of the collection.
+        """
+        n = self._items.get(value)
+        if not n:
+            return False
+        if n == 1:
+            del self._items[value]
+        else:
+            self._items[value] = n - 1
+        self._size -= 1
+        self._list = None
+        return True
 
     def __len__(self) -> int:
-        return len(self.items)
+        return self._size
 
     def __setitem__(self, key, value) -> None:
         raise RuntimeError("items should not be overwritten.")
@@ -76,7 +145,7 @@ class collection(Generic[T]):
         return self.items.__getitem__(key)
 
     def __contains__(self, obj) -> bool:
-        return self.items.__contains__(obj)
+        return obj in self._items
 
     def __iter__(self):
         return iter(self.items)
@@ -87,7 +156,7 @@ class collection(Generic[T]):
     __repr__ = __str__
 
     def __bool__(self):
-        return self.items != []
+        return self._size > 0
 
     def append(self, value: T) -> None:
         if isinstance(value, self.type):
@@ -96,7 +165,7 @@ class collection(Generic[T]):
             raise TypeError(f"Object is not of type {self.type.__name__}")
 
     def remove(self, value: T) -> None:
-        if value in self.items:
+        if value in self._items:
             self.property._del(self.object, value)
 
     def index(self, key: T) -> int:
@@ -107,26 +176,26 @@ class collection(Generic[T]):
     # OCL members (from SMW by Ivan Porres, http://www.abo.fi/~iporres/smw)
 
     def size(self):
-        return len(self.items)
+        return self._size
 
     def includes(self, o):
-        return o in self.items
+        return o in self._items
 
     def excludes(self, o):
         return not self.includes(o)
 
     def count(self, o):
-        return self.items.count(o)
+        return self._items.get(o, 0)
 
     def includesAll(self, c):
         for o in c:
-            if o not in self.items:
+            if o not in self._items:
                 return 0
         return 1
 
     def excludesAll(self, c):
         for o in c:
-            if o in self.items:
+            if o in self._items:
                 return 0
         return 1
 
@@ -140,7 +209,7 @@ class collection(Generic[T]):
         return [f(v) for v in self.items]
 
     def isEmpty(self):
-        return len(self.items) == 0
+        return self._size == 0
 
     def nonEmpty(self):
         return not self.isEmpty()
@@ -150,15 +219,18 @@ class collection(Generic[T]):
 
         Return true if swap was successful.
         """
+        items = collectionlist(self.items)
         try:
-            i1 = self.items.index(item1)
-            i2 = self.items.index(item2)
-            self.items[i1], self.items[i2] = self.items[i2], self.items[i1]
-
-            self.object.handle(AssociationUpdated(self.object, self.property))
-            return True
-        except (IndexError, ValueError):
+            i1 = items.index(item1)
+            i2 = items.index(item2)
+        except ValueError:
             return False
 
+        items[i1], items[i2] = items[i2], items[i1]
+        self.items = items
+
+        self.object.handle(AssociationUpdated(self.object, self.property))
+        return True
+
     def order(self, key):
-        self.items.sort(key=key)
+        self.items = collectionlist(sorted(self.items, key=key))
@@ -10,9 +10,22 @@ import textwrap
 import uuid
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import TYPE_CHECKING, Iterator, Optional, Sequence, Union
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import gaphas
+from gaphas.tree import Tree
 
 from gaphor.core.modeling.collection import collection
 from gaphor.core.modeling.coremodel import Element, PackageableElement
@@ -100,34 +113,52 @@ def removesuffix(self: str, suffix: str) -> str:
         return self[:]
 
 
-@lru_cache()
-def attrname(obj, lower_name):
-    """Look up a real attribute name based on a lower case (normalized)
-    name."""
-    for name in dir(obj):
+@lru_cache(maxsize=None)
+def attrname(cls: type, lower_name: str) -> str:
+    """Look up a real attribute name of a class based on a lower case
+    (normalized) name."""
+    for name in dir(cls):
         if name.lower() == lower_name:
             return name
     return lower_name
 
 
-def rgetattr(obj, names):
-    """Recursively het a name, based on a list of names."""
-    name, *tail = names
-    v = getattr(obj, attrname(obj, name), None)
-    if isinstance(v, (collection, list, tuple)):
-        if tail:
-            for m in v:
-                yield from rgetattr(m, tail)
-        else:
-            yield from v
-    else:
-        if tail:
-            yield from rgetattr(v, tail)
-        elif v is not None:
-            yield v
+@lru_cache(maxsize=None)
+def attrpath(name: str) -> Tuple[str, ...]:
+    """Split a (dotted) attribute name from a selector into its parts."""
+    return tuple(name.split("."))
+
 
+def rgetattr(obj, names: Sequence[str]) -> List[object]:
+    """Recursively get a name, based on a list of names.
 
-def attrstr(obj):
+    Attribute names are resolved once per class. Values are collected
+    from collections along the way.
+    """
+    values: List[object] = [obj]
+    for name in names:
+        found: List[object] = []
+        for o in values:
+            cls: type = type(o)
+            v = getattr(o, attrname(cls, name), None)
+            if isinstance(v, (collection, list, tuple)):
+                found.extend(v)
+            elif v is not None:
+                found.append(v)
+        if not found:
+            return found
+        values = found
+    return values
+
+
+def attrvalue(values: List[object]) -> str:
+    """Lower case string representation of the values of an attribute."""
+    if len(values) == 1:
+        return attrstr(values[0]).strip()
+    return " ".join(map(attrstr, values)).strip()
+
+
+def attrstr(obj: object) -> str:
     """Returns lower-case string representation of an attribute."""
     if isinstance(obj, str):
         return obj.lower()
@@ -157,8 +188,7 @@ class StyledDiagram:
         return (StyledItem(item, view) for item in self.diagram.canvas.get_root_items())
 
     def attribute(self, name: str) -> str:
-        fields = name.split(".")
-        return " ".join(map(attrstr, rgetattr(self.diagram, fields))).strip()
+        return attrvalue(rgetattr(self.diagram, attrpath(name)))
 
     def state(self):
         return ()
@@ -194,10 +224,10 @@ class StyledItem:
         return (StyledItem(child, view) for child in children)
 
     def attribute(self, name: str) -> str:
-        fields = name.split(".")
-        a = " ".join(map(attrstr, rgetattr(self.item, fields))).strip()
+        fields = attrpath(name)
+        a = attrvalue(rgetattr(self.item, fields))
         if (not a) and self.item.subject:
-            a = " ".join(map(attrstr, rgetattr(self.item.subject, fields))).strip()
+            a = attrvalue(rgetattr(self.item.subject, fields))
         return a
 
     def state(self) -> Sequence[str]:
@@ -213,13 +243,42 @@ class StyledItem:
         return ()
 
 
+class ItemTree(Tree):
+    """The tree of items on a canvas.
+
+    The version is increased every time items are added, removed or
+    moved to another parent. Items are indexed by id.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.version = 0
+        self.items_by_id: Dict[str, Presentation] = {}
+
+    def add(self, node, parent=None, index=None):
+        super().add(node, parent, index)
+        self.items_by_id[node.id] = node
+        self.version += 1
+
+    def remove(self, node):
+        super().remove(node)
+        if self.items_by_id.get(node.id) is node:
+            del self.items_by_id[node.id]
+        self.version += 1
+
+    def reparent(self, node, parent, index=None):
+        super().reparent(node, parent, index)
+        self.version += 1
+
+
 class DiagramCanvas(gaphas.Canvas):
     """DiagramCanvas extends the gaphas.Canvas class.
 
     Updates to the canvas can be blocked by setting the block_updates
-    property to true.  A save function can be applied to all root canvas
-    items.  Canvas items can be selected with an optional expression
-    filter.
+    property to true.  Automatic updates, caused by update requests, can be
+    postponed by setting the defer_updates property. A save function can be
+    applied to all root canvas items.  Canvas items can be selected with an
+    optional expression filter.
     """
 
     def __init__(self, diagram: Diagram):
@@ -231,11 +290,39 @@ class DiagramCanvas(gaphas.Canvas):
         super().__init__(
             lambda item: UpdateContext(style=diagram.style(StyledItem(item)))
         )
+        # Replace the item tree, so changes to its structure can be tracked,
+        # also when they're made by the undo manager.
+        self._tree = ItemTree()
         self._diagram = diagram
         self._block_updates = False
+        self._defer_updates = False
+        self._update_deferred = False
+        # Set when an item on the canvas requested an update, e.g. because
+        # it was moved. It's up to the user of this flag to reset it.
+        self.modified = False
 
     diagram = property(lambda s: s._diagram)
 
+    def lookup(self, id: str) -> Optional[Presentation]:
+        """Find an item on the canvas by id."""
+        return self._tree.items_by_id.get(id)  # type: ignore[no-any-return]
+
+    @property
+    def structure_version(self) -> int:
+        """Changes if items are added, removed or reparented."""
+        return self._tree.version  # type: ignore[no-any-return]
+
+    def request_update(self, item, *args, **kwargs):
+        """Request an update for an item and mark the canvas as modified."""
+        self.modified = True
+        super().request_update(item, *args, **kwargs)
+
+    def request_matrix_update(self, item):
+        """Request a matrix update for an item and mark the canvas as
+        modified."""
+        self.modified = True
+        super().request_matrix_update(item)
+
     def _set_block_updates(self, block):
         """Sets the block_updates property.
 
@@ -248,6 +335,27 @@ class DiagramCanvas(gaphas.Canvas):
 
     block_updates = property(lambda s: s._block_updates, _set_block_updates)
 
+    def _set_defer_updates(self, defer):
+        """Sets the defer_updates property.
+
+        While set, update requests are collected. If unset, all
+        collected requests are handled in one update.
+        """
+        self._defer_updates = defer
+        if not defer and self._update_deferred:
+            self._update_deferred = False
+            self.update_now()
+
+    defer_updates = property(lambda s: s._defer_updates, _set_defer_updates)
+
+    def update(self):
+        """Update the canvas, or postpone the update if defer_updates is
+        set."""
+        if self._defer_updates:
+            self._update_deferred = True
+            return
+        super().update()
+
     def update_now(self):
         """Update the diagram canvas, unless block_updates is true."""
 
@@ -303,19 +411,88 @@ class Diagram(PackageableElement):
         """
 
         super().__init__(id, model)
-        self.canvas = DiagramCanvas(self)
+        self._canvas = DiagramCanvas(self)
+        self._canvas_loader: Optional[Callable[[], None]] = None
+        self._deferred_subjects: FrozenSet[Id] = frozenset()
+        self._style_cache: Dict[Tuple[Presentation, Sequence[str]], Style] = {}
+        self._style_cache_key: Optional[Tuple[StyleSheet, int, int]] = None
+
+    @property
+    def canvas(self) -> DiagramCanvas:
+        """The canvas, containing the diagram items.
+
+        If the diagram items have not been loaded yet, they are loaded
+        first.
+        """
+        if self._canvas_loader:
+            self.load_canvas()
+        return self._canvas
+
+    @property
+    def canvas_loaded(self) -> bool:
+        """Are the diagram items loaded?"""
+        return self._canvas_loader is None
+
+    def defer_canvas(
+        self, loader: Callable[[], None], subjects: Iterable[Id] = ()
+    ) -> None:
+        """Postpone loading the diagram items until the canvas is needed.
+
+        ``subjects`` are the ids of the elements shown by the items. The
+        loader function is called at most once.
+        """
+        self._canvas_loader = loader
+        self._deferred_subjects = frozenset(subjects)
+
+    def shows_deferred(self, element: Element) -> bool:
+        """Are there items for ``element`` that have not been loaded yet?"""
+        return self._canvas_loader is not None and element.id in self._deferred_subjects
+
+    def load_canvas(self) -> None:
+        """Load the diagram items, if that has not happened already."""
+        loader = self._canvas_loader
+        if loader:
+            self._canvas_loader = None
+            self._deferred_subjects = frozenset()
+            loader()
 
     @property
     def styleSheet(self) -> Optional[StyleSheet]:
         model = self.model
-        style_sheet = next(model.select(StyleSheet), None)
+        style_sheet = model.style_sheet
         if not style_sheet:
             style_sheet = self.model.create(StyleSheet)
             style_sheet.styleSheet = DEFAULT_STYLE_SHEET
         return style_sheet
 
     def style(self, node: StyleNode) -> Style:
+        """Compute the style for a node.
+
+        Styles of diagram items are cached, per item and state (hover,
+        focus, etc.). The cache is cleared if the style sheet changes,
+        an attribute used in the style sheet is updated, or items are
+        added, removed or reparented. The returned style should not be
+        modified.
+        """
         style_sheet = self.styleSheet
+        assert style_sheet
+        if not isinstance(node, StyledItem) or (
+            node.view and style_sheet.relational_state
+        ):
+            return self._compute_style(style_sheet, node)
+
+        cache_key = (style_sheet, style_sheet.version, self._canvas.structure_version)
+        if cache_key != self._style_cache_key:
+            self._style_cache.clear()
+            self._style_cache_key = cache_key
+
+        key = (node.item, tuple(node.state()))
+        style = self._style_cache.get(key)
+        if style is None:
+            style = self._style_cache[key] = self._compute_style(style_sheet, node)
+        return style
+
+    def _compute_style(self, style_sheet: StyleSheet, node: StyleNode) -> Style:
         return {
             **FALLBACK_STYLE,  # type: ignore[misc]
             **style_sheet.match(node),
@@ -330,7 +507,7 @@ class Diagram(PackageableElement):
     def postload(self):
         """Handle post-load functionality for the diagram canvas."""
         super().postload()
-        self.canvas.postload()
+        self._canvas.postload()
 
     def create(self, type, parent=None, subject=None):
         """Create a new canvas item on the canvas.
@@ -358,13 +535,14 @@ class Diagram(PackageableElement):
         return item
 
     def lookup(self, id):
-        for item in self.canvas.get_all_items():
-            if item.id == id:
-                return item
+        return self.canvas.lookup(id)
 
     def unlink(self):
         """Unlink all canvas items then unlink this diagram."""
 
+        # Items that have not been loaded do not need to be unlinked
+        self._canvas_loader = None
+        self._deferred_subjects = frozenset()
         for item in self.canvas.get_all_items():
             try:
                 item.unlink()
@@ -10,6 +10,7 @@ from typing import (
     Callable,
     Iterator,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -24,6 +25,7 @@ from gaphor.core.modeling.properties import relation_many, relation_one, umlprop
 if TYPE_CHECKING:
     from gaphor.core.modeling.coremodel import Comment
     from gaphor.core.modeling.presentation import Presentation
+    from gaphor.core.modeling.stylesheet import StyleSheet
 
 __all__ = ["Element"]
 
@@ -40,7 +42,31 @@ class UnlinkEvent:
 Id = Union[str, bool]
 
 
-class Element:
+class ElementClass(type):
+    """Meta class for elements.
+
+    It keeps track of changes to the ``umlproperty``'s of element classes,
+    so the table of properties returned by ``Element.umlproperties()`` can
+    be cached. Properties can be added to a class at any time, for example
+    association stubs are added when an association is first used.
+    """
+
+    generation = 0
+
+    def __setattr__(cls, name, value):
+        if isinstance(value, umlproperty) or isinstance(
+            cls.__dict__.get(name), umlproperty
+        ):
+            ElementClass.generation += 1
+        super().__setattr__(name, value)
+
+    def __delattr__(cls, name):
+        if isinstance(cls.__dict__.get(name), umlproperty):
+            ElementClass.generation += 1
+        super().__delattr__(name)
+
+
+class Element(metaclass=ElementClass):
     """Base class for all model data classes."""
 
     appliedStereotype: relation_many[Element]
@@ -84,14 +110,27 @@ class Element:
         return self._model
 
     @classmethod
-    def umlproperties(class_):
-        """Iterate over all properties."""
+    def umlproperties(class_) -> Iterator[umlproperty]:
+        """Iterate over all properties, ordered by name."""
+        generation = ElementClass.generation
+        cache: Optional[Tuple[int, Tuple[umlproperty, ...]]] = class_.__dict__.get(
+            "_umlproperties_cache"
+        )
+        if cache and cache[0] == generation:
+            return iter(cache[1])
+
         umlprop = umlproperty
-        for propname in dir(class_):
-            if not propname.startswith("_"):
-                prop = getattr(class_, propname)
-                if isinstance(prop, umlprop):
-                    yield prop
+        props = tuple(
+            prop
+            for prop in (
+                getattr(class_, propname)
+                for propname in dir(class_)
+                if not propname.startswith("_")
+            )
+            if isinstance(prop, umlprop)
+        )
+        type.__setattr__(class_, "_umlproperties_cache", (generation, props))
+        return iter(props)
 
     def save(self, save_func):
         """Save the state by calling save_func(name, value)."""
@@ -110,6 +149,19 @@ class Element:
         else:
             prop.load(self, value)
 
+    def load_many(self, name, values):
+        """Loads a list of values in name at once.
+
+        This is faster than loading the values one by one, since no
+        events are created.
+        """
+        try:
+            prop = getattr(type(self), name)
+        except AttributeError:
+            log.exception(f"'{type(self).__name__}' has no property '{name}'")
+        else:
+            prop.load_many(self, values)
+
     def __str__(self):
         return f"<{self.__class__.__module__}.{self.__class__.__name__} element {self._id}>"
 
@@ -199,6 +251,13 @@ class RepositoryProtocol(Protocol):
     def select(self, expression: None) -> Iterator[Element]:
         ...
 
+    def query(self, element_type: Type[T], **values: object) -> Iterator[T]:
+        ...
+
+    @property
+    def style_sheet(self) -> Optional[StyleSheet]:
+        ...
+
     def watcher(
         self, element: Element, default_handler: Optional[Handler] = None
     ) -> EventWatcherProtocol:
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import uuid
 from collections import OrderedDict
 from contextlib import contextmanager
@@ -9,26 +11,40 @@ from typing import (
     TYPE_CHECKING,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
+    cast,
     overload,
 )
 
 from gaphor.abc import Service
+from gaphor.core.eventmanager import event_handler
 from gaphor.core.modeling.diagram import Diagram
 from gaphor.core.modeling.element import Element, UnlinkEvent
 from gaphor.core.modeling.elementdispatcher import ElementDispatcher, EventWatcher
 from gaphor.core.modeling.event import (
     ElementCreated,
     ElementDeleted,
+    ElementUpdated,
     ModelFlushed,
     ModelReady,
 )
 from gaphor.core.modeling.presentation import Presentation
+from gaphor.core.modeling.properties import (
+    association,
+    attribute,
+    enumeration,
+    redefine,
+    umlproperty,
+)
+from gaphor.core.modeling.stylesheet import StyleSheet
+from gaphor.event import TransactionBegin, TransactionCommit, TransactionRollback
 
 if TYPE_CHECKING:
     from gaphor.core.eventmanager import EventManager  # noqa
@@ -37,6 +53,61 @@ if TYPE_CHECKING:
 T = TypeVar("T", bound=Element)
 
 
+class PropertyIndex:
+    """Index of elements of a type, by the value of a property.
+
+    The property can be an attribute, an enumeration or an association.
+    For [0..*] associations, an element is indexed by each of its values.
+    """
+
+    def __init__(self, type: Type[Element], name: str):
+        prop = getattr(type, name, None)
+        while isinstance(prop, redefine):
+            prop = prop.original
+        if not isinstance(prop, (attribute, enumeration, association)):
+            raise TypeError(
+                f"{type.__name__}.{name} is not an attribute or association"
+            )
+        self.type = type
+        self.name = name
+        self.property: umlproperty = prop
+        self._elements: Dict[object, Dict[Element, None]] = {}
+        self._keys: Dict[Element, Tuple[object, ...]] = {}
+
+    def keys(self, element: Element) -> Tuple[object, ...]:
+        value: object = self.property._get(element)
+        if self.property.upper == 1:
+            return (value,)
+        return tuple(cast(Iterable[object], value))
+
+    def add(self, element: Element) -> None:
+        keys = self.keys(element)
+        self._keys[element] = keys
+        for key in keys:
+            self._elements.setdefault(key, {})[element] = None
+
+    def remove(self, element: Element) -> None:
+        for key in self._keys.pop(element, ()):
+            elements = self._elements[key]
+            del elements[element]
+            if not elements:
+                del self._elements[key]
+
+    def update(self, element: Element) -> None:
+        self.remove(element)
+        self.add(element)
+
+    def clear(self) -> None:
+        self._elements.clear()
+        self._keys.clear()
+
+    def lookup(self, value: object) -> Iterator[Element]:
+        return iter(self._elements.get(value, ()))
+
+    def matches(self, element: Element, value: object) -> bool:
+        return value in self._keys.get(element, ())
+
+
 class ElementFactory(Service):
     """The ElementFactory is used to create elements and do lookups to
     elements.
@@ -57,9 +128,24 @@ class ElementFactory(Service):
         self.event_manager = event_manager
         self.element_dispatcher = element_dispatcher
         self._elements: Dict[str, Element] = OrderedDict()
+        # Elements per (concrete) class, and the order in which
+        # elements were added, so typed selections keep the model order
+        self._elements_by_type: Dict[Type[Element], Dict[str, Element]] = {}
+        self._position: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._indexes: Dict[Tuple[Type[Element], str], PropertyIndex] = {}
+        self._indexes_by_property: Dict[umlproperty, List[PropertyIndex]] = {}
+        self._style_sheet: Optional[StyleSheet] = None
         self._block_events = 0
 
+        if event_manager:
+            event_manager.subscribe(self._on_transaction_begin)
+            event_manager.subscribe(self._on_transaction_end)
+
     def shutdown(self):
+        if self.event_manager:
+            self.event_manager.unsubscribe(self._on_transaction_begin)
+            self.event_manager.unsubscribe(self._on_transaction_end)
         self.flush()
 
     def create(self, type: Type[T]) -> T:
@@ -77,9 +163,102 @@ class ElementFactory(Service):
         if not type or not issubclass(type, Element) or issubclass(type, Presentation):
             raise TypeError(f"Type {type} is not a valid model element")
         obj = type(id, self)
-        self._elements[id] = obj
+        self._add_element(obj)
         return obj
 
+    def _add_element(self, element: Element) -> None:
+        """Add an element to the factory and its type index.
+
+        The element is added at the end, also if it was removed before
+        (e.g. by undo).
+        """
+        id = cast(str, element.id)
+        old = self._elements.get(id)
+        if old is not None:
+            self._remove_element(old)
+        self._elements[id] = element
+        self._elements_by_type.setdefault(type(element), {})[id] = element
+        self._position[id] = next(self._counter)
+        for index in self._indexes.values():
+            if isinstance(element, index.type):
+                index.add(element)
+        if self._style_sheet is None and isinstance(element, StyleSheet):
+            self._style_sheet = element
+
+    def _remove_element(self, element: Element) -> bool:
+        """Remove an element from the factory.
+
+        Returns ``True`` if the element was part of the factory.
+        """
+        id = cast(str, element.id)
+        if self._elements.get(id) is not element:
+            return False
+        del self._elements[id]
+        del self._position[id]
+        cls = self._indexed_type(element)
+        elements = self._elements_by_type[cls]
+        del elements[id]
+        if not elements:
+            del self._elements_by_type[cls]
+        for index in self._indexes.values():
+            index.remove(element)
+        if element is self._style_sheet:
+            self._style_sheet = next(self._select_type(StyleSheet), None)
+        return True
+
+    def _indexed_type(self, element: Element) -> Type[Element]:
+        """The class ``element`` is indexed by.
+
+        This is the class of the element, unless its class has been
+        changed after it was added.
+        """
+        cls = type(element)
+        if element.id in self._elements_by_type.get(cls, ()):
+            return cls
+        return next(
+            cls
+            for cls, elements in self._elements_by_type.items()
+            if element.id in elements
+        )
+
+    def type_changed(self, element: Element) -> None:
+        """Update the indexes after the class of ``element`` has changed.
+
+        The element keeps its position in the model.
+        """
+        id = cast(str, element.id)
+        if self._elements.get(id) is not element:
+            return
+        old_type = self._indexed_type(element)
+        new_type = type(element)
+        if old_type is not new_type:
+            elements = self._elements_by_type[old_type]
+            del elements[id]
+            if not elements:
+                del self._elements_by_type[old_type]
+            position = self._position
+            self._elements_by_type[new_type] = {
+                cast(str, e.id): e
+                for e in sorted(
+                    (*self._elements_by_type.get(new_type, {}).values(), element),
+                    key=lambda e: position[cast(str, e.id)],
+                )
+            }
+        for index in self._indexes.values():
+            if isinstance(element, index.type):
+                index.update(element)
+            else:
+                index.remove(element)
+
+    @property
+    def style_sheet(self) -> Optional[StyleSheet]:
+        """The style sheet of the model.
+
+        This is the first style sheet in the model, or ``None`` if the
+        model has no style sheet.
+        """
+        return self._style_sheet
+
     def size(self) -> int:
         """Return the amount of elements currently in the factory."""
         return len(self._elements)
@@ -111,16 +290,80 @@ class ElementFactory(Service):
         if expression is None:
             yield from self._elements.values()
         elif isinstance(expression, type):
-            yield from (e for e in self._elements.values() if isinstance(e, expression))
+            yield from self._select_type(expression)
         else:
             yield from (e for e in self._elements.values() if expression(e))
 
+    def _select_type(self, type: Type[T]) -> Iterator[T]:
+        """Iterate elements of ``type`` (including subclasses), in the order
+        they were added to the factory."""
+        buckets = [
+            cast(Dict[str, T], elements)
+            for cls, elements in self._elements_by_type.items()
+            if issubclass(cls, type)
+        ]
+        if not buckets:
+            return iter(())
+        if len(buckets) == 1:
+            return iter(buckets[0].values())
+        position = self._position
+        return iter(
+            heapq.merge(
+                *(elements.values() for elements in buckets),
+                key=lambda e: position[cast(str, e.id)],
+            )
+        )
+
     def lselect(
         self, expression: Union[Callable[[Element], bool], Type[T], None] = None
     ) -> List[Element]:
         """Like select(), but returns a list."""
         return list(self.select(expression))
 
+    def add_index(self, type: Type[Element], name: str) -> PropertyIndex:
+        """Index elements of ``type`` by the value of property ``name``.
+
+        The index is kept up to date by the events emitted by the
+        elements. It is rebuilt when a new model is ready, since no
+        events are emitted while a model is loaded. Indexes are created
+        on demand by ``query()``.
+        """
+        index = self._indexes.get((type, name))
+        if index is None:
+            index = PropertyIndex(type, name)
+            for element in self._select_type(type):
+                index.add(element)
+            self._indexes[(type, name)] = index
+            self._indexes_by_property.setdefault(index.property, []).append(index)
+        return index
+
+    def query(self, element_type: Type[T], **values: object) -> Iterator[T]:
+        """Iterate elements of ``element_type`` with the given property
+        values.
+
+        For example, ``query(Class, name="Foo")`` finds all classes
+        named "Foo". For [0..*] associations, elements that contain the
+        value are returned. Elements are returned in model order.
+        """
+        indexes = [
+            (self.add_index(element_type, name), value)
+            for name, value in values.items()
+        ]
+        if not indexes:
+            return self._select_type(element_type)
+        (index, value), *others = indexes
+        position = self._position
+        return iter(
+            sorted(
+                (
+                    cast(T, e)
+                    for e in index.lookup(value)
+                    if all(i.matches(e, v) for i, v in others)
+                ),
+                key=lambda e: position[cast(str, e.id)],
+            )
+        )
+
     def keys(self) -> Iterator[str]:
         """Return a list with all id's in the factory."""
         return iter(self._elements.keys())
@@ -137,6 +380,20 @@ class ElementFactory(Service):
         element_dispatcher = self.element_dispatcher
         return EventWatcher(element, element_dispatcher, default_handler)
 
+    @event_handler(TransactionBegin)
+    def _on_transaction_begin(self, event: TransactionBegin) -> None:
+        """Collect canvas updates while the transaction is open."""
+        for diagram in self._select_type(Diagram):
+            if diagram.canvas_loaded:
+                diagram.canvas.defer_updates = True
+
+    @event_handler(TransactionCommit, TransactionRollback)
+    def _on_transaction_end(self, event: object) -> None:
+        """Update each canvas that received update requests, once."""
+        for diagram in list(self._select_type(Diagram)):
+            if diagram.canvas_loaded:
+                diagram.canvas.defer_updates = False
+
     def flush(self) -> None:
         """Flush all elements (remove them from the factory).
 
@@ -146,7 +403,9 @@ class ElementFactory(Service):
         with self.block_events():
             for element in self.lselect(Diagram):
                 assert isinstance(element, Diagram)
-                element.canvas.block_updates = True
+                # Do not load the items of diagrams that were never opened
+                if element.canvas_loaded:
+                    element.canvas.block_updates = True
                 element.unlink()
 
             for element in self.lselect():
@@ -157,6 +416,10 @@ class ElementFactory(Service):
     def model_ready(self) -> None:
         """Send notification that a new model has been loaded by means of the
         ModelReady event from gaphor.core.modeling.event."""
+        for index in self._indexes.values():
+            index.clear()
+            for element in self._select_type(index.type):
+                index.add(element)
         self.handle(ModelReady(self))
 
     @contextmanager
@@ -173,11 +436,38 @@ class ElementFactory(Service):
         """Handle events coming from elements."""
         if isinstance(event, UnlinkEvent):
             element = event.element
-            assert isinstance(element.id, str)
-            try:
-                del self._elements[element.id]
-            except KeyError:
+            if not self._remove_element(element):
                 return
             event = ElementDeleted(self, event.element)
+        elif isinstance(event, ElementUpdated):
+            self._update_indexes(event)
+            if event.property is Element.presentation and not self._block_events:
+                self._load_deferred_presentations(event.element)
+            if self._style_sheet:
+                self._style_sheet.element_updated(event)
         if self.event_manager and not self._block_events:
             self.event_manager.handle(event)
+
+    def _load_deferred_presentations(self, element: Element) -> None:
+        """Load the diagrams with items for ``element`` that are not loaded
+        yet, once the last loaded item is removed.
+
+        Otherwise the element would look unused, and be unlinked.
+        """
+        if element.presentation or element._unlink_lock:
+            return
+        for diagram in [
+            d for d in self._select_type(Diagram) if d.shows_deferred(element)
+        ]:
+            diagram.load_canvas()
+
+    def _update_indexes(self, event: ElementUpdated) -> None:
+        indexes = self._indexes_by_property.get(event.property)
+        if not indexes:
+            return
+        element = event.element
+        if self._elements.get(element.id) is not element:
+            return
+        for index in indexes:
+            if isinstance(element, index.type):
+                index.update(element)
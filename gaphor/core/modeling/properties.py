@@ -20,6 +20,7 @@ methods:
                       is to be removed (in case of associations with
                       multiplicity > 1).
     load(value):      load 'value' as the current value for this property
+    load_many(values): load a list of values at once (used while loading)
     save(save_func):  send the value of the property to save_func(name, value)
 """
 
@@ -154,6 +155,10 @@ class umlproperty:
     def load(self, obj, value):
         self._set(obj, value)
 
+    def load_many(self, obj, values):
+        for value in values:
+            self.load(obj, value)
+
     def postload(self, obj):
         pass
 
@@ -175,6 +180,12 @@ class umlproperty:
         for d in self._dependent_properties:
             d.propagate(event)
 
+    def _invalidate(self):
+        """Invalidate the values cached by dependent properties, without
+        sending events."""
+        for d in self._dependent_properties:
+            d._invalidate()
+
 
 class attribute(umlproperty, Generic[T]):
     """Attribute.
@@ -327,7 +338,7 @@ class association(umlproperty):
         self.upper = upper
         self.composite = composite
         self.opposite = opposite
-        self.stub: Optional[associationstub] = None
+        self.stub: Optional[Union[association, associationstub]] = None
 
     def save(self, obj, save_func: Callable[[str, object], None]):
         if hasattr(obj, self._name):
@@ -343,6 +354,64 @@ class association(umlproperty):
             )
         self._set(obj, value)
 
+    def load_many(self, obj, values):
+        """Load a list of values at once.
+
+        The values are added to the collection in one go and the
+        opposite ends are updated directly. No events are emitted, so
+        this should only be used while loading a model.
+        """
+        for value in values:
+            if not isinstance(value, self.type):
+                raise AttributeError(
+                    "Value for %s should be of type %s (%s)"
+                    % (self.name, self.type.__name__, type(value).__name__)
+                )
+
+        if self.upper == 1:
+            for value in values:
+                self._set(obj, value)
+            return
+
+        c: collection = self._get_many(obj)
+        new_values = [value for value in dict.fromkeys(values) if value not in c]
+        if not new_values:
+            return
+
+        c._extend(new_values)
+        for value in new_values:
+            self._load_opposite(obj, value)
+        self._invalidate()
+
+    def _load_opposite(self, obj, value) -> None:
+        if self.opposite:
+            opposite = getattr(type(value), self.opposite)
+            if isinstance(opposite, association):
+                if not opposite.opposite:
+                    opposite.stub = self
+                opposite._load_from_opposite(value, obj)
+            else:
+                opposite._set(value, obj, from_opposite=True)
+        else:
+            self._set_opposite(obj, value)
+
+    def _load_from_opposite(self, obj, value) -> None:
+        """Add a value that is loaded on the opposite end.
+
+        Since both ends are kept in sync, ``value`` can not be part of
+        this end yet.
+        """
+        if self.upper == 1:
+            old = getattr(obj, self._name, None)
+            if old is None:
+                setattr(obj, self._name, value)
+            elif old is not value:
+                self._set_one(obj, value, from_opposite=True)
+                return
+        else:
+            self._get_many(obj)._add(value)
+        self._invalidate()
+
     def __str__(self):
         if self.lower == self.upper:
             s = f"<association {self.name}: {self.type.__name__}[{self.lower}]"
@@ -413,7 +482,7 @@ class association(umlproperty):
         if value in c:
             return
 
-        c.items.append(value)
+        c._add(value)
         self._set_opposite(obj, value, from_opposite)
 
         self.handle(AssociationAdded(obj, self, value))
@@ -463,17 +532,11 @@ class association(umlproperty):
 
         c: collection = self._get_many(obj)
         if c:
-            items = c.items
-            try:
-                items.remove(value)
-            except ValueError:
-                pass
-            else:
-                if do_notify:
-                    self.handle(AssociationDeleted(obj, self, value))
+            if c._remove(value) and do_notify:
+                self.handle(AssociationDeleted(obj, self, value))
 
             # Remove items collection if empty
-            if not items:
+            if not c:
                 delattr(obj, self._name)
 
     def _del_opposite(self, obj, value, from_opposite):
@@ -650,6 +713,10 @@ class derived(umlproperty, Generic[T]):
     def _set(self, obj, value):
         raise AttributeError("Can not set values on a union")
 
+    def _invalidate(self):
+        self.version += 1
+        super()._invalidate()
+
     def _del(self, obj, value=None):
         raise AttributeError("Can not delete values on a union")
 
@@ -749,6 +816,23 @@ class derivedunion(derived[T]):
                     u.add(tmp)
         return collectionlist(u)
 
+    def _union_contains(self, obj, value, exclude=None) -> bool:
+        """Check if value is part of the union, without creating the union."""
+        for s in self.subsets:
+            if s is exclude or not object_has_property(obj, s):
+                continue
+
+            tmp = s.__get__(obj)
+            if tmp is value:
+                return True
+            try:
+                if tmp and value in tmp:
+                    return True
+            except TypeError:
+                # [0..1] property
+                pass
+        return False
+
     def propagate(self, event):
         """Re-emit state change for the derived union (as Derived*Event's).
 
@@ -769,9 +853,8 @@ class derivedunion(derived[T]):
         if not isinstance(event, AssociationUpdated):
             return
 
-        values = self._union(event.element, exclude=event.property)
-
         if self.upper == 1:
+            values = self._union(event.element, exclude=event.property)
             assert isinstance(event, AssociationSet)
             old_value, new_value = event.old_value, event.new_value
             # This is a [0..1] event
@@ -787,22 +870,29 @@ class derivedunion(derived[T]):
             # Only one subset element, so pass the values on
             self.handle(DerivedSet(event.element, self, old_value, new_value))
         else:
+            element = event.element
+            property = event.property
+
             if isinstance(event, AssociationSet):
                 old_value, new_value = event.old_value, event.new_value
-                if old_value and old_value not in values:
-                    self.handle(DerivedDeleted(event.element, self, old_value))
-                if new_value and new_value not in values:
-                    self.handle(DerivedAdded(event.element, self, new_value))
+                if old_value and not self._union_contains(
+                    element, old_value, exclude=property
+                ):
+                    self.handle(DerivedDeleted(element, self, old_value))
+                if new_value and not self._union_contains(
+                    element, new_value, exclude=property
+                ):
+                    self.handle(DerivedAdded(element, self, new_value))
 
             elif isinstance(event, AssociationAdded):
                 new_value = event.new_value
-                if new_value not in values:
-                    self.handle(DerivedAdded(event.element, self, new_value))
+                if not self._union_contains(element, new_value, exclude=property):
+                    self.handle(DerivedAdded(element, self, new_value))
 
             elif isinstance(event, AssociationDeleted):
                 old_value = event.old_value
-                if old_value not in values:
-                    self.handle(DerivedDeleted(event.element, self, old_value))
+                if not self._union_contains(element, old_value, exclude=property):
+                    self.handle(DerivedDeleted(element, self, old_value))
 
             elif isinstance(event, AssociationUpdated):
                 self.handle(DerivedUpdated(event.element, self))
@@ -852,6 +942,10 @@ class redefine(umlproperty):
         if self.original.name == self.name:
             self.original.load(obj, value)
 
+    def load_many(self, obj, values):
+        if self.original.name == self.name:
+            self.original.load_many(obj, values)
+
     def postload(self, obj):
         if self.original.name == self.name:
             self.original.postload(obj)
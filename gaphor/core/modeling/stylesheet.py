@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 from gaphor.core.modeling import Element
-from gaphor.core.modeling.event import AttributeUpdated
+from gaphor.core.modeling.event import AttributeUpdated, ElementUpdated
 from gaphor.core.modeling.properties import attribute
 from gaphor.core.styling import CompiledStyleSheet, Style, StyleNode
 
 
 class StyleSheet(Element):
+    """The style sheet of a model.
+
+    Computed styles can be cached, as long as the style sheet's
+    ``version`` does not change. The version is increased if the style
+    sheet is modified, or if an attribute referred to by a selector is
+    updated.
+    """
+
     _compiled_style_sheet: CompiledStyleSheet
 
     def __init__(self, id=None, model=None):
         super().__init__(id, model)
+        self.version = 0
 
         self.compile_style_sheet()
 
@@ -18,6 +27,19 @@ class StyleSheet(Element):
 
     def compile_style_sheet(self) -> None:
         self._compiled_style_sheet = CompiledStyleSheet(self.styleSheet)
+        self.version += 1
+
+    @property
+    def relational_state(self) -> bool:
+        """Do styles depend on the state (hover, focus, etc.) of other
+        elements?"""
+        return self._compiled_style_sheet.relational_state
+
+    def element_updated(self, event: ElementUpdated) -> None:
+        """Invalidate computed styles if the updated property is used in
+        a selector."""
+        if event.property.name.lower() in self._compiled_style_sheet.attributes:
+            self.version += 1
 
     def match(self, node: StyleNode) -> Style:
         return self._compiled_style_sheet.match(node)
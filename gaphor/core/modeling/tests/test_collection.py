@@ -134,3 +134,43 @@ def test_swap():
     c.swap("a", "c")
     assert c.items == ["c", "b", "a"]
     assert o.events
+
+
+def test_swap_unknown_item():
+    o = MockElement()
+    c: collection[str] = collection(None, o, str)
+    c.items = ["a", "b"]  # type: ignore[assignment]
+
+    assert not c.swap("a", "z")
+    assert c.items == ["a", "b"]
+    assert not o.events
+
+
+def test_order():
+    c: collection[str] = collection(None, None, str)
+    c.items = ["b", "c", "a"]  # type: ignore[assignment]
+    c.order(lambda e: e)
+
+    assert c.items == ["a", "b", "c"]
+
+
+def test_remove_keeps_order():
+    c: collection[str] = collection(None, None, str)
+    c.items = ["a", "b", "c", "d"]  # type: ignore[assignment]
+    items = c.items
+
+    assert c._remove("b")
+    assert not c._remove("b")
+    assert c.items == ["a", "c", "d"]
+    assert items == ["a", "b", "c", "d"]
+    assert "b" not in c
+    assert len(c) == 3
+
+
+def test_slicing_returns_collectionlist():
+    c: collection[str] = collection(None, None, str)
+    c.items = ["a", "b"]  # type: ignore[assignment]
+
+    assert isinstance(c.items, collectionlist)
+    assert list(c[:]) == ["a", "b"]
+    assert c[1] == "b"
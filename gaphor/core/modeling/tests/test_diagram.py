@@ -3,6 +3,7 @@ import pytest
 
 from gaphor.core.eventmanager import EventManager
 from gaphor.core.modeling import ElementFactory, Presentation, StyleSheet
+from gaphor.transaction import Transaction
 from gaphor.UML import Diagram
 
 
@@ -69,3 +70,41 @@ def test_diagram_stylesheet_is_always_there(element_factory):
     diagram = element_factory.create(Diagram)
 
     assert diagram.styleSheet is not None
+
+
+def test_lookup_item_by_id(element_factory):
+    diagram = element_factory.create(Diagram)
+    example = diagram.create(Example)
+
+    assert diagram.lookup(example.id) is example
+    assert diagram.lookup("unknown") is None
+
+
+def test_lookup_of_removed_item(element_factory):
+    diagram = element_factory.create(Diagram)
+    parent = diagram.create(Example)
+    child = diagram.create(Example, parent=parent)
+
+    diagram.canvas.remove(parent)
+
+    assert diagram.lookup(parent.id) is None
+    assert diagram.lookup(child.id) is None
+
+    diagram.canvas.add(parent)
+
+    assert diagram.lookup(parent.id) is parent
+
+
+def test_canvas_updates_are_deferred_until_transaction_commit():
+    event_manager = EventManager()
+    element_factory = ElementFactory(event_manager)
+    diagram = element_factory.create(Diagram)
+
+    with Transaction(event_manager):
+        diagram.create(Example)
+
+        assert diagram.canvas.defer_updates
+        assert diagram.canvas.require_update()
+
+    assert not diagram.canvas.defer_updates
+    assert not diagram.canvas.require_update()
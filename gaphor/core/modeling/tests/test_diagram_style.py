@@ -2,8 +2,8 @@ import gaphas
 import pytest
 
 from gaphor.core.eventmanager import EventManager
-from gaphor.core.modeling import ElementFactory, Presentation
-from gaphor.core.modeling.diagram import Diagram, StyledDiagram, StyledItem
+from gaphor.core.modeling import Comment, ElementFactory, Presentation, StyleSheet
+from gaphor.core.modeling.diagram import Diagram, StyledDiagram, StyledItem, attrname
 
 
 @pytest.fixture
@@ -45,3 +45,85 @@ def test_diagram_has_no_parent(diagram):
     node = StyledDiagram(diagram)
 
     assert node.parent() is None
+
+
+def test_item_style_is_cached(diagram):
+    item = diagram.create(DemoItem)
+
+    style = diagram.style(StyledItem(item))
+
+    assert diagram.style(StyledItem(item)) is style
+
+
+def test_item_style_cache_is_cleared_when_style_sheet_changes(diagram, element_factory):
+    style_sheet = element_factory.create(StyleSheet)
+    item = diagram.create(DemoItem)
+    diagram.style(StyledItem(item))
+
+    style_sheet.styleSheet = "demo { color: red }"
+
+    assert diagram.style(StyledItem(item))["color"] == (1, 0, 0, 1)
+
+
+def test_item_style_cache_is_cleared_for_referenced_attributes(
+    diagram, element_factory
+):
+    style_sheet = element_factory.create(StyleSheet)
+    style_sheet.styleSheet = "demo[body=red] { color: red }"
+    comment = element_factory.create(Comment)
+    item = diagram.create(DemoItem, subject=comment)
+    version = style_sheet.version
+
+    comment.body = "red"
+
+    assert style_sheet.version > version
+    assert diagram.style(StyledItem(item))["color"] == (1, 0, 0, 1)
+
+
+def test_item_style_cache_is_kept_for_other_attributes(diagram, element_factory):
+    style_sheet = element_factory.create(StyleSheet)
+    style_sheet.styleSheet = "demo[body=red] { color: red }"
+    diagram.name = "diagram"
+    version = style_sheet.version
+
+    diagram.name = "new name"
+
+    assert style_sheet.version == version
+
+
+def test_item_style_cache_is_cleared_when_item_is_reparented(diagram, element_factory):
+    style_sheet = element_factory.create(StyleSheet)
+    style_sheet.styleSheet = "demo demo { color: red }"
+    parent = diagram.create(DemoItem)
+    item = diagram.create(DemoItem)
+    diagram.style(StyledItem(item))
+
+    diagram.canvas.reparent(item, parent)
+
+    assert diagram.style(StyledItem(item))["color"] == (1, 0, 0, 1)
+
+
+def test_attribute_path_of_subject(diagram, element_factory):
+    comment = element_factory.create(Comment)
+    comment.body = "Some Text"
+    item = diagram.create(DemoItem, subject=comment)
+    node = StyledItem(item)
+
+    assert node.attribute("subject.body") == "some text"
+    assert node.attribute("subject.notanattribute") == ""
+
+
+def test_attribute_path_through_collection(diagram, element_factory):
+    comment = element_factory.create(Comment)
+    comment.annotatedElement = element_factory.create(Comment)
+    comment.annotatedElement = element_factory.create(Comment)
+    item = diagram.create(DemoItem, subject=comment)
+    node = StyledItem(item)
+
+    assert node.attribute("annotatedelement") == "comment comment"
+    assert node.attribute("subject.annotatedelement.body") == ""
+
+
+def test_attribute_names_are_resolved_per_class():
+    assert attrname(Comment, "annotatedelement") == "annotatedElement"
+    assert attrname(Comment, "notanattribute") == "notanattribute"
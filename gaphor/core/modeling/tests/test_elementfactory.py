@@ -4,7 +4,7 @@ import pytest
 
 from gaphor.core import event_handler
 from gaphor.core.eventmanager import EventManager
-from gaphor.core.modeling import ElementFactory
+from gaphor.core.modeling import Diagram, ElementFactory, StyleSheet
 from gaphor.core.modeling.event import (
     ElementCreated,
     ElementDeleted,
@@ -13,7 +13,14 @@ from gaphor.core.modeling.event import (
     ServiceEvent,
 )
 from gaphor.core.modeling.presentation import Presentation
-from gaphor.UML import Parameter
+from gaphor.UML import (
+    Association,
+    Class,
+    InstanceSpecification,
+    Namespace,
+    Package,
+    Parameter,
+)
 
 
 @pytest.fixture
@@ -43,6 +50,16 @@ def test_flush(factory):
     assert len(list(factory.values())) == 0, list(factory.values())
 
 
+def test_flush_does_not_load_diagram_items(factory):
+    diagram = factory.create(Diagram)
+    loaded = []
+    diagram.defer_canvas(lambda: loaded.append(diagram))
+
+    factory.flush()
+
+    assert not loaded
+
+
 def test_without_application(factory):
     factory.create(Parameter)
     assert factory.size() == 1, factory.size()
@@ -77,6 +94,143 @@ def test_unlink(factory):
     assert len(list(factory.values())) == 0, list(factory.values())
 
 
+def test_select_by_type(factory):
+    c1 = factory.create(Class)
+    p = factory.create(Package)
+    c2 = factory.create(Class)
+
+    assert factory.lselect(Class) == [c1, c2]
+    assert factory.lselect(Package) == [p]
+    assert factory.lselect(Namespace) == [c1, p, c2]
+    assert factory.lselect(Association) == []
+
+
+def test_select_by_type_after_unlink(factory):
+    c1 = factory.create(Class)
+    c2 = factory.create(Class)
+
+    c1.unlink()
+
+    assert factory.lselect(Class) == [c2]
+
+
+def test_select_by_type_after_reinsert(factory):
+    c1 = factory.create(Class)
+    p = factory.create(Package)
+
+    factory._remove_element(c1)
+    factory._add_element(c1)
+
+    assert factory.lselect(Namespace) == [p, c1]
+    assert factory.lookup(c1.id) is c1
+
+
+def test_select_by_type_after_flush(factory):
+    factory.create(Class)
+    factory.flush()
+
+    assert factory.lselect(Class) == []
+
+
+def test_query_by_attribute(factory):
+    c1 = factory.create(Class)
+    c1.name = "Foo"
+    c2 = factory.create(Class)
+    c2.name = "Bar"
+
+    assert list(factory.query(Class, name="Foo")) == [c1]
+
+    c2.name = "Foo"
+
+    assert list(factory.query(Class, name="Foo")) == [c1, c2]
+    assert list(factory.query(Class, name="Bar")) == []
+
+
+def test_query_by_association(factory):
+    p = factory.create(Package)
+    c1 = factory.create(Class)
+    c2 = factory.create(Class)
+    c1.package = p
+
+    assert list(factory.query(Class, package=p)) == [c1]
+    assert list(factory.query(Class, package=None)) == [c2]
+
+    del c1.package
+
+    assert list(factory.query(Class, package=p)) == []
+
+
+def test_query_by_many_association(factory):
+    c = factory.create(Class)
+    i1 = factory.create(InstanceSpecification)
+    i2 = factory.create(InstanceSpecification)
+    i1.classifier = c
+    i2.classifier = factory.create(Class)
+    i2.classifier = c
+
+    assert list(factory.query(InstanceSpecification, classifier=c)) == [i1, i2]
+
+
+def test_query_by_multiple_values(factory):
+    p = factory.create(Package)
+    c1 = factory.create(Class)
+    c1.name = "Foo"
+    c1.package = p
+    c2 = factory.create(Class)
+    c2.name = "Foo"
+
+    assert list(factory.query(Class, name="Foo", package=p)) == [c1]
+
+
+def test_query_after_unlink(factory):
+    c = factory.create(Class)
+    c.name = "Foo"
+    factory.add_index(Class, "name")
+
+    c.unlink()
+
+    assert list(factory.query(Class, name="Foo")) == []
+
+
+def test_index_is_rebuilt_when_model_is_ready(factory):
+    factory.add_index(Class, "package")
+    with factory.block_events():
+        p = factory.create_as(Package, "p")
+        c = factory.create_as(Class, "c")
+        # Bulk loading does not emit events
+        p.load_many("ownedClassifier", [c])
+    factory.model_ready()
+
+    assert list(factory.query(Class, package=p)) == [c]
+
+
+def test_index_on_non_property(factory):
+    with pytest.raises(TypeError):
+        factory.add_index(Class, "isKindOf")
+
+
+def test_style_sheet(factory):
+    assert factory.style_sheet is None
+
+    style_sheet = factory.create(StyleSheet)
+    factory.create(StyleSheet)
+
+    assert factory.style_sheet is style_sheet
+
+
+def test_style_sheet_after_unlink(factory):
+    style_sheet = factory.create(StyleSheet)
+    other = factory.create(StyleSheet)
+
+    style_sheet.unlink()
+
+    assert factory.style_sheet is other
+
+    other.unlink()
+
+    assert factory.style_sheet is None
+
+
 # Event handlers are registered as persisting top level handlers, since no
 # unsubscribe functionality is provided.
 handled = False
@@ -536,3 +536,114 @@ def test_composite():
     a.unlink()
     assert a.is_unlinked
     assert b.is_unlinked
+
+
+def test_association_load_many():
+    class A(Element):
+        many: relation_many[B]
+
+    class B(Element):
+        one: relation_one[A]
+
+    A.many = association("many", B, opposite="one")
+    B.one = association("one", A, 0, 1, opposite="many")
+
+    a = A()
+    b1 = B()
+    b2 = B()
+    a.load_many("many", [b1, b2, b1])
+
+    assert list(a.many) == [b1, b2]
+    assert b1.one is a
+    assert b2.one is a
+
+
+def test_association_load_many_with_opposite_already_loaded():
+    class A(Element):
+        many: relation_many[B]
+
+    class B(Element):
+        one: relation_one[A]
+
+    A.many = association("many", B, opposite="one")
+    B.one = association("one", A, 0, 1, opposite="many")
+
+    a = A()
+    b1 = B()
+    b2 = B()
+    b1.load("one", a)
+    a.load_many("many", [b1, b2])
+
+    assert list(a.many) == [b1, b2]
+    assert b2.one is a
+
+
+def test_association_load_many_does_not_send_events():
+    events = []
+
+    class A(Element):
+        many: relation_many[A]
+
+        def handle(self, event):
+            events.append(event)
+
+    A.many = association("many", A)
+
+    a = A()
+    a.load_many("many", [A(), A()])
+
+    assert len(a.many) == 2
+    assert not events
+
+
+def test_association_load_many_updates_derivedunion():
+    class A(Element):
+        a: relation_many[A]
+        u: relation_many[A]
+
+    A.a = association("a", A)
+    A.u = derivedunion("u", object, 0, "*", A.a)
+
+    a = A()
+    assert len(a.u) == 0
+    b = A()
+    a.load_many("a", [b])
+
+    assert b in a.u
+
+
+def test_umlproperties_are_updated_when_properties_are_added():
+    class A(Element):
+        pass
+
+    class B(A):
+        pass
+
+    A.a = attribute("a", str)
+    assert A.a in B.umlproperties()
+
+    A.b = attribute("b", str)
+    assert A.a in B.umlproperties()
+    assert A.b in B.umlproperties()
+
+    del A.a
+    assert A.b in B.umlproperties()
+    assert not any(p.name == "a" for p in B.umlproperties())
+
+
+def test_umlproperties_include_association_stubs():
+    class A(Element):
+        one: relation_one[B]
+
+    class B(Element):
+        pass
+
+    A.one = association("one", B, 0, 1)
+    props = list(B.umlproperties())
+
+    a = A()
+    a.one = B()
+
+    assert A.one.stub
+    assert A.one.stub not in props
+    assert A.one.stub in B.umlproperties()
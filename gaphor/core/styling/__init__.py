@@ -1,14 +1,15 @@
 from __future__ import annotations
 
+import heapq
 import operator
 from typing import (
-    Callable,
     Dict,
     Generator,
     Iterator,
     List,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Union,
 )
@@ -26,7 +27,7 @@ from gaphor.core.styling.properties import (
     TextDecoration,
     VerticalAlign,
 )
-from gaphor.core.styling.selectors import compile_selector_list
+from gaphor.core.styling.selectors import CompiledSelector, compile_selector_list
 
 
 class StyleNode(Protocol):
@@ -54,30 +55,57 @@ def merge_styles(styles) -> Style:
 
 
 class CompiledStyleSheet:
+    """A style sheet, ready to be matched against style nodes.
+
+    Rules are grouped by the element name they apply to. Each group is
+    kept in (specificity, order) order, so only the groups for the node's
+    name and ``*`` have to be checked and merged.
+
+    ``attributes`` contains the names of all attributes the selectors
+    refer to. Attribute selectors also match on the subject of an item,
+    hence ``subject`` is included as well. If a selector depends on the
+    state (hover, focus, etc.) of other elements than the one matched,
+    ``relational_state`` is set.
+    """
+
     def __init__(self, css: str):
         self.selectors = [
             (selspec[0], selspec[1], order, declarations)
             for order, (selspec, declarations) in enumerate(parse_style_sheet(css))
             if selspec != "error"
         ]
+        self.buckets: Dict[str, List[Tuple]] = {}
+        self.attributes: Set[str] = set()
+        self.relational_state = False
+        for selector in sorted(self.selectors, key=SELECTOR_SORT_KEY):
+            pred = selector[0]
+            self.buckets.setdefault(pred.name, []).append(selector)
+            self.attributes.update(pred.attributes)
+            self.relational_state = self.relational_state or pred.relational_state
+        if self.attributes:
+            self.attributes.add("subject")
 
     def match(self, node: StyleNode) -> Style:
-        results = sorted(
-            (
-                (specificity, order, declarations)
-                for pred, specificity, order, declarations in self.selectors
-                if pred(node)
-            ),
-            key=MATCH_SORT_KEY,
+        buckets = self.buckets
+        wildcard = buckets.get("*", ())
+        named = buckets.get(node.name(), ())
+        candidates = (
+            heapq.merge(wildcard, named, key=SELECTOR_SORT_KEY)
+            if wildcard and named
+            else wildcard or named
+        )
+        return merge_styles(
+            declarations
+            for pred, _specificity, _order, declarations in candidates
+            if pred(node)
         )
-        return merge_styles(decl for _, _, decl in results)
 
 
 def parse_style_sheet(
     css,
 ) -> Generator[
     Union[
-        Tuple[Tuple[Callable[[object], bool], Tuple[int, int, int]], Dict[str, object]],
+        Tuple[Tuple[CompiledSelector, Tuple[int, int, int]], Dict[str, object]],
         Tuple[Literal["error"], Union[tinycss2.ast.ParseError, SelectorError]],
     ],
     None,
@@ -109,4 +137,4 @@ def parse_style_sheet(
         yield from ((selector, declaration) for selector in selectors)
 
 
-MATCH_SORT_KEY = operator.itemgetter(0, 1)
+SELECTOR_SORT_KEY = operator.itemgetter(1, 2)
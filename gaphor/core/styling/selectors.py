@@ -3,6 +3,9 @@ Sapin and Guillaume Ayoub."""
 
 import re
 from functools import singledispatch
+from typing import Set
+
+from typing_extensions import Protocol
 
 from gaphor.core.styling import parser
 
@@ -10,6 +13,18 @@ from gaphor.core.styling import parser
 split_whitespace = re.compile("[^ \t\r\n\f]+").findall
 
 
+class CompiledSelector(Protocol):
+    """A compiled selector: a predicate that tells if it matches a style
+    node."""
+
+    name: str
+    attributes: Set[str]
+    relational_state: bool
+
+    def __call__(self, el: object) -> bool:
+        ...
+
+
 def compile_selector_list(input):
     """Compile a (comma-separated) list of selectors.
 
@@ -18,11 +33,69 @@ def compile_selector_list(input):
     Returns a list of compiled selectors.
     """
     return [
-        (compile_node(selector), selector.specificity)
+        (compile_selector(selector), selector.specificity)
         for selector in parser.parse(input)
     ]
 
 
+def compile_selector(selector) -> CompiledSelector:
+    """Compile a single (complex) selector.
+
+    The element name the selector applies to is stored on the compiled
+    selector as ``name``. It is ``"*"`` if the selector can match any
+    element. The attribute names the selector refers to are stored as
+    ``attributes``, and ``relational_state`` tells if the selector
+    depends on the state (hover, focus, etc.) of other elements than the
+    one it matches.
+    """
+    expr: CompiledSelector = compile_node(selector)
+    expr.name = selector_name(selector)
+    expr.attributes, expr.relational_state = selector_dependencies(selector)
+    return expr
+
+
+def selector_name(selector):
+    """The name of the elements a selector can match, based on the type
+    selector in the rightmost compound selector, or ``"*"``."""
+    while isinstance(selector, parser.CombinedSelector):
+        selector = selector.right
+    for sel in selector.simple_selectors:
+        if isinstance(sel, parser.LocalNameSelector):
+            return sel.lower_local_name
+    return "*"
+
+
+STATE_PSEUDO_CLASSES = ("root", "hover", "focus", "active", "drop")
+
+
+def selector_dependencies(selector):
+    """Return the attribute names (path elements) a selector refers to, and
+    whether it depends on the state of elements other than the matched
+    one."""
+    attributes = set()
+    relational_state = False
+
+    def walk(sel, relational):
+        nonlocal relational_state
+        if isinstance(sel, parser.CombinedSelector):
+            walk(sel.left, True)
+            walk(sel.right, relational)
+        elif isinstance(sel, parser.CompoundSelector):
+            for s in sel.simple_selectors:
+                walk(s, relational)
+        elif isinstance(sel, parser.AttributeSelector):
+            attributes.update(sel.lower_name.split("."))
+        elif isinstance(sel, parser.PseudoClassSelector):
+            if relational and sel.name in STATE_PSEUDO_CLASSES:
+                relational_state = True
+        elif isinstance(sel, parser.FunctionalPseudoClassSelector):
+            for s in parser.parse(sel.arguments):
+                walk(s, relational or sel.name == "has")
+
+    walk(selector, False)
+    return attributes, relational_state
+
+
 @singledispatch
 def compile_node(selector):
     """Dynamic dispatch selector nodes.
@@ -111,7 +184,7 @@ def compile_pseudo_class_selector(selector: parser.PseudoClassSelector):
     name = selector.name
     if name == "empty":
         return lambda el: not next(el.children(), 0)
-    elif name in ("root", "hover", "focus", "active", "drop"):
+    elif name in STATE_PSEUDO_CLASSES:
         return lambda el: name in el.state()
     else:
         raise parser.SelectorError("Unknown pseudo-class", name)
@@ -217,3 +217,34 @@ def test_broken_line_style():
 
     props = compiled_style_sheet.match(Node("mytype"))
     assert props.get("line-style") is None
+
+
+def test_compiled_style_sheet_groups_rules_by_name():
+    css = """
+    classitem { color: red }
+    nested classitem { color: blue }
+    * { color: green }
+    packageitem { color: yellow }
+    """
+
+    compiled_style_sheet = CompiledStyleSheet(css)
+
+    assert set(compiled_style_sheet.buckets) == {"classitem", "packageitem", "*"}
+    assert len(compiled_style_sheet.buckets["classitem"]) == 2
+
+
+def test_specificity_order_is_kept_across_rule_groups():
+    css = """
+    classitem { font-size: 1 }
+    :is(classitem) { font-size: 2 }
+    classitem { font-family: sans }
+    * { font-family: serif; font-size: 3 }
+    """
+
+    compiled_style_sheet = CompiledStyleSheet(css)
+
+    props = compiled_style_sheet.match(Node("classitem"))
+
+    assert props.get("font-size") == 2
+    assert props.get("font-family") == "sans"
+    assert compiled_style_sheet.match(Node("other")).get("font-size") == 3
@@ -300,3 +300,21 @@ def test_has_and_is_selector():
             children=[Node("foo", children=[Node("bar", state=("hover",))])],
         )
     )
+
+
+@pytest.mark.parametrize(
+    "css,attributes,relational_state",
+    [
+        ["classitem {}", set(), False],
+        ["classitem[subject.name=a] {}", {"subject", "name"}, False],
+        ["classitem:hover {}", set(), False],
+        ["classitem:hover nested {}", set(), True],
+        ["classitem:has(nested:focus) {}", set(), True],
+        ["classitem:not([isabstract]:hover) {}", {"isabstract"}, False],
+    ],
+)
+def test_selector_dependencies(css, attributes, relational_state):
+    (selector, specificity), payload = next(parse_style_sheet(css))
+
+    assert selector.attributes == attributes
+    assert selector.relational_state == relational_state
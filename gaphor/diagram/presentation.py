@@ -11,7 +11,7 @@ from gaphas.geometry import Rectangle, distance_rectangle_point
 
 from gaphor.core.modeling.presentation import Presentation, S
 from gaphor.core.styling import Style
-from gaphor.diagram.shapes import combined_style
+from gaphor.diagram.shapes import combined_style, reconcile
 from gaphor.diagram.text import TextAlign, text_point_at_line
 
 
@@ -78,6 +78,10 @@ class ElementPresentation(Presentation[S], gaphas.Element):
     To create a shape (boxes, text), assign a shape to `self.shape`. If
     the shape can change, for example, because styling needs to change,
     implement the method `update_shapes()` and set self.shape there.
+
+    A new shape is reconciled with the current one: shapes of the same
+    type and key are kept and updated, so only new shapes are created.
+    The item is only updated if the shapes changed.
     """
 
     width: int
@@ -93,8 +97,9 @@ class ElementPresentation(Presentation[S], gaphas.Element):
         return self._port_sides[self._ports.index(port)]
 
     def _set_shape(self, shape):
-        self._shape = shape
-        self.request_update()
+        self._shape, changed = reconcile(self._shape, shape)
+        if changed:
+            self.request_update()
 
     shape = property(lambda s: s._shape, _set_shape)
 
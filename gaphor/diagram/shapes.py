@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import replace
 from math import pi
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Hashable, List, Optional, Tuple
 
 from gaphas.geometry import Rectangle
 
@@ -23,6 +23,52 @@ class cairo_state:
         self._cr.restore()
 
 
+def reconcile(old, new) -> Tuple[object, bool]:
+    """Update a retained shape (tree) with a newly created one.
+
+    If ``old`` and ``new`` are the same kind of shape, with the same key,
+    ``old`` takes over the configuration of ``new`` and is returned. This
+    way the shapes, and their state (sizes, focus box, etc.), are kept
+    when a shape tree is recreated. Otherwise ``new`` is returned.
+
+    Returns a tuple (shape, changed). ``changed`` is false if the shape
+    (tree) will be laid out exactly as before.
+    """
+    if old is new:
+        return old, False
+    if (
+        old is None
+        or type(old) is not type(new)
+        or getattr(old, "key", None) != getattr(new, "key", None)
+        or not hasattr(old, "update_from")
+    ):
+        return new, True
+    return old, old.update_from(new)
+
+
+def reconcile_children(old_children, new_children) -> Tuple[Tuple[object, ...], bool]:
+    """Reconcile child shapes.
+
+    Children are matched by key, or by position for children without a
+    key. Returns a tuple (children, changed).
+    """
+
+    def child_key(index, shape):
+        key = getattr(shape, "key", None)
+        return (type(shape), index if key is None else key)
+
+    old_by_key = {child_key(n, c): c for n, c in enumerate(old_children)}
+    children = []
+    changed = len(old_children) != len(new_children)
+    for n, c in enumerate(new_children):
+        child, child_changed = reconcile(old_by_key.get(child_key(n, c)), c)
+        children.append(child)
+        changed = changed or child_changed
+    return tuple(children), changed or any(
+        new is not old for new, old in zip(children, old_children)
+    )
+
+
 def combined_style(item_style: Style, inline_style: Style = {}) -> Style:
     """Combine context style and inline styles into one style."""
     return {**item_style, **inline_style}  # type: ignore[misc]
@@ -112,11 +158,24 @@ class Box:
         *children,
         style: Style = {},
         draw: Optional[Callable[[Box, DrawContext, Rectangle], None]] = None,
+        key: Hashable = None,
     ):
         self.children = children
         self.sizes: List[Tuple[int, int]] = []
         self._inline_style = style
         self._draw_border = draw
+        self.key = key
+
+    def update_from(self, other: Box) -> bool:
+        self.children, changed = reconcile_children(self.children, other.children)
+        changed = (
+            changed
+            or self._inline_style != other._inline_style
+            or self._draw_border is not other._draw_border
+        )
+        self._inline_style = other._inline_style
+        self._draw_border = other._draw_border
+        return changed
 
     def __len__(self):
         return len(self.children)
@@ -185,11 +244,19 @@ class IconBox:
     - padding: a tuple (top, right, bottom, left)
     """
 
-    def __init__(self, icon, *children, style: Style = {}):
+    def __init__(self, icon, *children, style: Style = {}, key: Hashable = None):
         self.icon = icon
         self.children = children
         self.sizes: List[Tuple[int, int]] = []
         self._inline_style = style
+        self.key = key
+
+    def update_from(self, other: IconBox) -> bool:
+        self.icon, icon_changed = reconcile(self.icon, other.icon)
+        self.children, changed = reconcile_children(self.children, other.children)
+        changed = changed or icon_changed or self._inline_style != other._inline_style
+        self._inline_style = other._inline_style
+        return changed
 
     def size(self, context: UpdateContext):
         style = combined_style(context.style, self._inline_style)
@@ -252,11 +319,32 @@ class IconBox:
 
 
 class Text:
-    def __init__(self, text=lambda: "", width=lambda: -1, style: Style = {}):
+    def __init__(
+        self,
+        text=lambda: "",
+        width=lambda: -1,
+        style: Style = {},
+        key: Hashable = None,
+    ):
         self._text = text if callable(text) else lambda: text
         self.width = width if callable(width) else lambda: width
         self._inline_style = style
         self._layout = Layout()
+        self.key = key
+
+    def update_from(self, other: Text) -> bool:
+        # Compare with what was laid out last: the old text and width
+        # functions already return the current values.
+        layout = self._layout
+        changed = (
+            other.text() != layout.text
+            or other.width() != layout.width
+            or self._inline_style != other._inline_style
+        )
+        self._text = other._text
+        self.width = other.width
+        self._inline_style = other._inline_style
+        return changed
 
     def text(self):
         try:
@@ -310,8 +398,14 @@ class Text:
 
 
 class EditableText(Text):
-    def __init__(self, text=lambda: "", width=lambda: -1, style: Style = {}):
-        super().__init__(text, width, {"min-width": 30, "min-height": 14, **style})  # type: ignore[misc]
+    def __init__(
+        self,
+        text=lambda: "",
+        width=lambda: -1,
+        style: Style = {},
+        key: Hashable = None,
+    ):
+        super().__init__(text, width, {"min-width": 30, "min-height": 14, **style}, key)  # type: ignore[misc]
         self.focus_box = Rectangle()
 
     @property
@@ -6,10 +6,12 @@ from gaphor.core.modeling.diagram import FALLBACK_STYLE
 from gaphor.diagram.shapes import (
     Box,
     DrawContext,
+    EditableText,
     IconBox,
     Text,
     TextAlign,
     VerticalAlign,
+    reconcile,
 )
 
 
@@ -183,3 +185,70 @@ def test_text_width_min_height(context):
 
     _, h = text.size(context)
     assert h == 40
+
+
+def test_reconcile_keeps_shapes_of_same_type():
+    text = EditableText(text="old")
+    box = Box(text)
+
+    new_box = Box(EditableText(text="new"), style={"min-width": 10})
+    shape, changed = reconcile(box, new_box)
+
+    assert shape is box
+    assert changed
+    assert shape.children[0] is text
+    assert text.text() == "new"
+    assert box._inline_style == {"min-width": 10}
+
+
+def test_reconcile_replaces_shapes_of_other_type():
+    box = Box(Text(text="old"))
+
+    new_text = EditableText(text="new")
+    _, changed = reconcile(box, Box(new_text))
+
+    assert box.children[0] is new_text
+    assert changed
+
+
+def test_reconcile_matches_children_by_key():
+    a = Text(text="a", key="a")
+    b = Text(text="b", key="b")
+    box = Box(a, b)
+
+    reconcile(box, Box(Text(text="new", key="new"), Text(text="b", key="b")))
+
+    assert box.children[0] is not a
+    assert box.children[1] is b
+
+
+def test_reconcile_reports_no_change_for_the_same_shapes(context):
+    box = Box(Text(text="a", key="a"), style={"min-width": 10})
+    box.size(context)
+
+    shape, changed = reconcile(
+        box, Box(Text(text="a", key="a"), style={"min-width": 10})
+    )
+
+    assert shape is box
+    assert not changed
+
+
+def test_reconcile_reports_changed_text(context):
+    text = Text(text="a")
+    box = Box(text)
+    box.size(context)
+
+    _, changed = reconcile(box, Box(Text(text="b")))
+
+    assert changed
+    assert text.text() == "b"
+
+
+def test_reconcile_reports_removed_children(context):
+    box = Box(Text(text="a", key="a"), Text(text="b", key="b"))
+    box.size(context)
+
+    _, changed = reconcile(box, Box(Text(text="a", key="a")))
+
+    assert changed
@@ -7,6 +7,7 @@ from gaphor.diagram.text import (
     TextAlign,
     TextDecoration,
     text_point_at_line,
+    text_size,
 )
 
 
@@ -101,3 +102,40 @@ def test_text_with_just_font_as_dict():
     w, h = Layout("Example", {"font-family": "sans", "font-size": 10}).size()
     assert w
     assert h
+
+
+def test_pango_layout_is_kept_by_the_layout():
+    font = {"font-family": "sans", "font-size": 10}
+    layout = Layout("Example", font)
+    pango_layout = layout.layout
+
+    layout.set_text("Other")
+
+    assert layout.layout is pango_layout
+    assert pango_layout.get_text() == "Other"
+
+
+def test_pango_layouts_are_not_shared():
+    font = {"font-family": "sans", "font-size": 10}
+
+    assert Layout("Example", font).layout is not Layout("Example", font).layout
+
+
+def test_text_size_is_cached():
+    font = {"font-family": "sans", "font-size": 10}
+    text_size.cache_clear()
+
+    size = Layout("Example", font).size()
+
+    assert Layout("Example", font).size() == size
+    assert text_size.cache_info().hits == 1
+
+
+def test_text_width_is_part_of_the_size():
+    font = {"font-family": "sans", "font-size": 10}
+    layout = Layout("Some words that can wrap", font)
+    w, h = layout.size()
+
+    layout.set_width(w / 2)
+
+    assert layout.size()[1] > h
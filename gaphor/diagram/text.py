@@ -1,6 +1,7 @@
 """Support classes for dealing with text."""
 
-from typing import Tuple, Union
+from functools import lru_cache
+from typing import Optional, Tuple, Union
 
 import gi
 from gaphas.canvas import instant_cairo_context
@@ -16,7 +17,78 @@ from gi.repository import GLib, Pango, PangoCairo  # noqa: isort:skip
 # fmt: on
 
 
+# Text sizes are cached by text and layout settings, so recreated text
+# shapes and identical labels do not need a Pango layout to find their size.
+TEXT_SIZE_CACHE_SIZE = 8192
+
+FontId = Tuple[str, Union[int, float], Optional[FontWeight], Optional[FontStyle]]
+
+
+@lru_cache(maxsize=None)
+def font_description(font_id: FontId) -> Pango.FontDescription:
+    font_family, font_size, font_weight, font_style = font_id
+
+    fd = Pango.FontDescription.new()
+    fd.set_family(font_family)
+    fd.set_absolute_size(font_size * Pango.SCALE)
+
+    if font_weight:
+        assert isinstance(font_weight, FontWeight)
+        fd.set_weight(getattr(Pango.Weight, font_weight.name))
+    if font_style:
+        assert isinstance(font_style, FontStyle)
+        fd.set_style(getattr(Pango.Style, font_style.name))
+    return fd
+
+
+def update_pango_layout(
+    layout: Pango.Layout,
+    text: str,
+    font_id: Optional[FontId],
+    underline: bool,
+    width: Union[int, float],
+    text_align: TextAlign,
+) -> Pango.Layout:
+    """Apply text and layout settings to a Pango layout."""
+    if font_id:
+        layout.set_font_description(font_description(font_id))
+    if underline:
+        # TODO: can this be done via Pango attributes instead?
+        layout.set_markup(f"<u>{GLib.markup_escape_text(text)}</u>", length=-1)
+    else:
+        layout.set_text(text, length=-1)
+    layout.set_width(-1 if width == -1 else int(width * Pango.SCALE))
+    layout.set_alignment(getattr(Pango.Alignment, text_align.name))
+    return layout
+
+
+@lru_cache(maxsize=TEXT_SIZE_CACHE_SIZE)
+def text_size(
+    text: str,
+    font_id: Optional[FontId],
+    underline: bool,
+    width: Union[int, float],
+    text_align: TextAlign,
+) -> Tuple[int, int]:
+    """The size of a text, in pixels."""
+    layout = update_pango_layout(
+        PangoCairo.create_layout(instant_cairo_context()),
+        text,
+        font_id,
+        underline,
+        width,
+        text_align,
+    )
+    return layout.get_pixel_size()  # type: ignore[no-any-return]
+
+
 class Layout:
+    """Text, font and size settings for a piece of text.
+
+    Sizes are taken from a shared cache. The Pango layout used for drawing
+    is created on first use and only updated when the settings change.
+    """
+
     def __init__(
         self,
         text="",
@@ -24,18 +96,19 @@ class Layout:
         text_align=TextAlign.CENTER,
         default_size=(0, 0),
     ):
-        self.layout = PangoCairo.create_layout(instant_cairo_context())
         self.underline = False
-        self.font_id = None
+        self.font_id: Optional[FontId] = None
         self.text = ""
         self.width = -1
+        self.text_align = text_align
         self.default_size = default_size
+        self._layout: Optional[Pango.Layout] = None
+        self._layout_settings: Optional[tuple] = None
 
         if font:
             self.set_font(font)
         if text:
             self.set_text(text)
-        self.set_alignment(text_align)
 
     def set(self, text=None, font=None, width=None, text_align=None):
         # Since text expressions can return False, we should also accomodate for that
@@ -51,74 +124,53 @@ class Layout:
     def set_font(self, font: Style):
         font_family = font.get("font-family")
         font_size = font.get("font-size")
-        font_weight = font.get("font-weight")
-        font_style = font.get("font-style")
         assert font_family, "Font family should be set"
         assert font_size, "Font size should be set"
 
-        font_id = (font_family, font_size, font_weight, font_style)
-        if font_id == self.font_id:
-            return
-
-        self.font_id = font_id
-
-        fd = Pango.FontDescription.new()
-        fd.set_family(font_family)
-        fd.set_absolute_size(font_size * Pango.SCALE)
-
-        if font_weight:
-            assert isinstance(font_weight, FontWeight)
-            fd.set_weight(getattr(Pango.Weight, font_weight.name))
-        if font_style:
-            assert isinstance(font_style, FontStyle)
-            fd.set_style(getattr(Pango.Style, font_style.name))
-
-        self.layout.set_font_description(fd)
-
-        underline = (
+        self.font_id = (
+            font_family,
+            font_size,
+            font.get("font-weight"),
+            font.get("font-style"),
+        )
+        self.underline = (
             font.get("text-decoration", TextDecoration.NONE) == TextDecoration.UNDERLINE
         )
 
-        if self.underline != underline:
-            self.underline = underline
-            self.update_text()
-
     def set_text(self, text: str):
-        if text != self.text:
-            self.text = text
-            self.update_text()
-
-    def update_text(self):
-        if self.underline:
-            # TODO: can this be done via Pango attributes instead?
-            self.layout.set_markup(
-                f"<u>{GLib.markup_escape_text(self.text)}</u>", length=-1
-            )
-        else:
-            self.layout.set_text(self.text, length=-1)
+        self.text = text
 
     def set_width(self, width: int):
         self.width = width
-        if width == -1:
-            self.layout.set_width(-1)
-        else:
-            self.layout.set_width(int(width * Pango.SCALE))
 
     def set_alignment(self, text_align: TextAlign):
-        self.layout.set_alignment(getattr(Pango.Alignment, text_align.name))
+        self.text_align = text_align
+
+    @property
+    def layout(self) -> Pango.Layout:
+        """The Pango layout used to draw this text."""
+        return self._pango_layout(self.width)
+
+    def _pango_layout(self, width) -> Pango.Layout:
+        settings = (self.text, self.font_id, self.underline, width, self.text_align)
+        if self._layout is None:
+            self._layout = PangoCairo.create_layout(instant_cairo_context())
+        if settings != self._layout_settings:
+            update_pango_layout(self._layout, *settings)
+            self._layout_settings = settings
+        return self._layout
 
     def size(self):
         if not self.text:
             return self.default_size
-        self.set_width(self.width)
-        return self.layout.get_pixel_size()
+        return text_size(
+            self.text, self.font_id, self.underline, self.width, self.text_align
+        )
 
     def show_layout(self, cr, width=None, default_size=None):
-        layout = self.layout
         if not self.text:
             return default_size or self.default_size
-        if width is not None:
-            layout.set_width(int(width * Pango.SCALE))
+        layout = self._pango_layout(self.width if width is None else width)
 
         if isinstance(cr, FreeHandCairoContext):
             PangoCairo.show_layout(cr.cr, layout)
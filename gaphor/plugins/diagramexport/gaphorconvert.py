@@ -4,6 +4,7 @@ import optparse
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 from gaphor.application import Session
 from gaphor.core.modeling import Diagram
@@ -55,6 +56,15 @@ def parse_options(argv):
         help="process diagrams which name matches given regular expression;"
         " name includes package name; regular expressions are case insensitive",
     )
+    parser.add_option(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        metavar="jobs",
+        type="int",
+        help="number of processes used to render diagrams, default 1",
+        default=1,
+    )
 
     options, args = parser.parse_args(argv)
 
@@ -64,15 +74,8 @@ def parse_options(argv):
     return options, args
 
 
-def main(argv=sys.argv[1:]):
-
-    options, args = parse_options(argv)
-
-    def message(msg):
-        if options.verbose:
-            print(msg, file=sys.stderr)
-
-    session = Session(
+def create_session():
+    return Session(
         services=[
             "event_manager",
             "component_registry",
@@ -82,6 +85,73 @@ def main(argv=sys.argv[1:]):
             "diagram_export",
         ]
     )
+
+
+def export_diagram(diagram_export, diagram, outfilename, format):
+    if format == "pdf":
+        diagram_export.save_pdf(outfilename, diagram)
+    elif format == "svg":
+        diagram_export.save_svg(outfilename, diagram)
+    elif format == "png":
+        diagram_export.save_png(outfilename, diagram)
+    else:
+        raise RuntimeError(f"Unknown file format: {format}")
+
+
+# The model loaded in a worker process
+_worker_session = None
+
+
+def init_worker(model):
+    """Load the model, once per worker process."""
+    global _worker_session
+    _worker_session = create_session()
+    storage.load(
+        model,
+        _worker_session.get_service("element_factory"),
+        _worker_session.get_service("modeling_language"),
+    )
+
+
+def export_in_worker(job):
+    """Render a diagram in a worker process.
+
+    Returns the diagram name and an error message, or ``None`` if the
+    diagram has been rendered.
+    """
+    diagram_id, pname, outfilename, format = job
+    assert _worker_session
+    factory = _worker_session.get_service("element_factory")
+    diagram_export = _worker_session.get_service("diagram_export")
+    try:
+        export_diagram(diagram_export, factory.lookup(diagram_id), outfilename, format)
+    except Exception as e:
+        return pname, f"{e.__class__.__name__}: {e}"
+    return pname, None
+
+
+def export_parallel(model, jobs, processes):
+    """Render diagrams with a pool of worker processes.
+
+    Yields a diagram name and an error message (or ``None``) per job.
+    """
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=init_worker, initargs=(model,)
+    ) as executor:
+        yield from executor.map(
+            export_in_worker, jobs, chunksize=max(1, len(jobs) // (processes * 4))
+        )
+
+
+def main(argv=sys.argv[1:]):
+
+    options, args = parse_options(argv)
+
+    def message(msg):
+        if options.verbose:
+            print(msg, file=sys.stderr)
+
+    session = create_session()
     factory = session.get_service("element_factory")
     modeling_language = session.get_service("modeling_language")
     diagram_export = session.get_service("diagram_export")
@@ -90,12 +160,15 @@ def main(argv=sys.argv[1:]):
     if options.regex:
         name_re = re.compile(options.regex, re.I)
 
+    failures = 0
+
     # we should have some gaphor files to be processed at this point
     for model in args:
         message(f"loading model {model}")
         storage.load(model, factory, modeling_language)
         message("ready for rendering")
 
+        jobs = []
         for diagram in factory.select(Diagram):
             odir = pkg2dir(diagram.package)
 
@@ -121,13 +194,20 @@ def main(argv=sys.argv[1:]):
                 message(f"creating dir {odir}")
                 os.makedirs(odir)
 
-            message(f"rendering: {pname} -> {outfilename}...")
+            if options.jobs > 1:
+                jobs.append((diagram.id, pname, outfilename, options.format))
+                continue
 
-            if options.format == "pdf":
-                diagram_export.save_pdf(outfilename, diagram)
-            elif options.format == "svg":
-                diagram_export.save_svg(outfilename, diagram)
-            elif options.format == "png":
-                diagram_export.save_png(outfilename, diagram)
-            else:
-                raise RuntimeError(f"Unknown file format: {options.format}")
+            message(f"rendering: {pname} -> {outfilename}...")
+            export_diagram(diagram_export, diagram, outfilename, options.format)
+
+        if jobs:
+            message(f"rendering {len(jobs)} diagrams with {options.jobs} processes")
+            for pname, error in export_parallel(model, jobs, options.jobs):
+                if error:
+                    failures += 1
+                    print(f"failed to render {pname}: {error}", file=sys.stderr)
+                else:
+                    message(f"rendered: {pname}")
+
+    return 1 if failures else 0
@@ -2,12 +2,17 @@
 
 from gaphor.core import event_handler
 from gaphor.core.eventmanager import EventManager
-from gaphor.core.modeling import ElementFactory
-from gaphor.services.undomanager import UndoManager
+from gaphor.core.modeling import Element, ElementFactory
+from gaphor.core.modeling.properties import attribute
+from gaphor.services.undomanager import ATTRIBUTE, GAPHAS, UndoManager, record_size
 from gaphor.tests.testcase import TestCase
 from gaphor.transaction import Transaction
 
 
+class A(Element):
+    attr = attribute("attr", str)
+
+
 class TestUndoManager(TestCase):
     def test_transactions(self):
 
@@ -397,3 +402,56 @@ class TestUndoManager(TestCase):
         assert p in element_factory.lselect()
 
         undo_manager.shutdown()
+
+
+def test_undo_stack_depth_from_properties(event_manager, element_factory):
+    undo_manager = UndoManager(event_manager, {"undo-stack-depth": 2})
+
+    for _ in range(3):
+        with Transaction(event_manager):
+            element_factory.create(Element)
+
+    assert len(undo_manager._undo_stack) == 2
+
+    undo_manager.shutdown()
+
+
+def test_undo_stack_is_bounded_by_size(event_manager, element_factory):
+    undo_manager = UndoManager(event_manager, {"undo-stack-size": 10000})
+    a = element_factory.create(A)
+
+    for n in range(4):
+        with Transaction(event_manager):
+            a.attr = str(n) * 4000
+
+    assert len(undo_manager._undo_stack) == 2
+    assert undo_manager._undo_stack[-1]._actions == [(ATTRIBUTE, A.attr, a, "2" * 4000)]
+
+    undo_manager.shutdown()
+
+
+def test_keep_last_transaction_if_too_big(event_manager, element_factory):
+    undo_manager = UndoManager(event_manager, {"undo-stack-size": 10})
+    a = element_factory.create(A)
+
+    with Transaction(event_manager):
+        a.attr = "a rather long value"
+    with Transaction(event_manager):
+        a.attr = "another rather long value"
+
+    assert len(undo_manager._undo_stack) == 1
+
+    undo_manager.undo_transaction()
+
+    assert a.attr == "a rather long value"
+
+    undo_manager.shutdown()
+
+
+def test_record_size_includes_gaphas_state_arguments():
+    def func(points):
+        pass
+
+    size = record_size((GAPHAS, func, {"points": [(0.0, 0.0), "x" * 4000]}))
+
+    assert size > 4000
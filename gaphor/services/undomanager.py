@@ -2,16 +2,16 @@
 
 Undoing and redoing actions is managed through the UndoManager.
 
-An undo action should be a callable object (called with no arguments).
+Changes are recorded as undo records: tuples of an opcode and its
+arguments, e.g. ``(ATTRIBUTE, attribute, element, old_value)``. Undoing a
+record causes a change, which is recorded for redo.
 
-An undo action should return a callable object that acts as redo function.
-If None is returned the undo action is considered to be the redo action as well.
-
-NOTE: it would be nice to use actions in conjunction with functools.partial.
+An undo action can also be a callable object (called with no arguments).
 """
 
 import logging
-from typing import Callable, List
+import sys
+from typing import List, Tuple
 
 from gaphas import state
 
@@ -39,6 +39,84 @@ from gaphor.transaction import Transaction, transactional
 
 logger = logging.getLogger(__name__)
 
+# Undo record opcodes
+CALL = 0  # (CALL, action)
+GAPHAS = 1  # (GAPHAS, func, kwargs)
+CREATE = 2  # (CREATE, factory, element)
+DELETE = 3  # (DELETE, factory, element)
+ATTRIBUTE = 4  # (ATTRIBUTE, attribute, element, value)
+ASSOCIATION_SET = 5  # (ASSOCIATION_SET, association, element, value)
+ASSOCIATION_DEL = 6  # (ASSOCIATION_DEL, association, element, value)
+
+DEFAULT_STACK_DEPTH = 20
+DEFAULT_STACK_SIZE = 64 * 1024 * 1024
+
+
+def _undo_call(event_manager, action):
+    action()
+
+
+def _undo_gaphas(event_manager, func, kwargs):
+    state.saveapply(func, kwargs)
+
+
+def _undo_create(event_manager, factory, element):
+    # The element may already be removed in an unlink call
+    factory._remove_element(element)
+    event_manager.handle(ElementDeleted(factory, element))
+
+
+def _undo_delete(event_manager, factory, element):
+    factory._add_element(element)
+    event_manager.handle(ElementCreated(factory, element))
+
+
+def _undo_attribute(event_manager, attribute, element, value):
+    attribute._set(element, value)
+
+
+def _undo_association_set(event_manager, association, element, value):
+    # Tell the association it should not need to let the opposite
+    # side connect (it has it's own signal)
+    association._set(element, value, from_opposite=True)
+
+
+def _undo_association_del(event_manager, association, element, value):
+    association._del(element, value, from_opposite=True)
+
+
+# Undo functions, by opcode
+UNDO = (
+    _undo_call,
+    _undo_gaphas,
+    _undo_create,
+    _undo_delete,
+    _undo_attribute,
+    _undo_association_set,
+    _undo_association_del,
+)
+
+
+def value_size(value) -> int:
+    """Estimate the memory used by a value in an undo record.
+
+    Model elements and diagram items are shared with the model, they are
+    not counted. Containers, such as the keyword arguments of Gaphas
+    state changes, are measured with their content.
+    """
+    if isinstance(value, (str, bytes, int, float)):
+        return sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value.values())
+    return 0
+
+
+def record_size(record: Tuple) -> int:
+    """Estimate the memory used by an undo record."""
+    return value_size(record)
+
 
 class ActionStack:
     """A transaction.
@@ -51,23 +129,25 @@ class ActionStack:
     """
 
     def __init__(self):
-        self._actions: List[Callable[[], None]] = []
+        self._actions: List[Tuple] = []
+        self.size = 0
 
-    def add(self, action):
-        self._actions.append(action)
+    def add(self, record):
+        self._actions.append(record)
+        self.size += record_size(record)
 
     def can_execute(self):
         return self._actions and True or False
 
     @transactional
-    def execute(self):
+    def execute(self, event_manager):
         self._actions.reverse()
 
-        for act in self._actions:
+        for record in self._actions:
             try:
-                act()
+                UNDO[record[0]](event_manager, *record[1:])
             except Exception:
-                logger.error(f"Error while undoing action {act}", exc_info=True)
+                logger.error(f"Error while undoing action {record}", exc_info=True)
 
 
 class UndoManagerStateChanged(ServiceEvent):
@@ -79,17 +159,19 @@ class UndoManager(Service, ActionProvider):
     nested transactions.
 
     The Undo manager sports an undo and a redo stack. Each stack
-    contains a set of actions that can be executed, just by calling them
-    (e.i action()) If something is returned by an action, that is
-    considered the callable to be used to undo or redo the last
-    performed action.
+    contains a set of transactions, containing undo records.
+
+    The stacks are bounded by the number of transactions
+    (``undo-stack-depth`` property) and by the estimated memory used by
+    the records (``undo-stack-size`` property, in bytes). The most recent
+    transaction is always kept.
     """
 
-    def __init__(self, event_manager):
+    def __init__(self, event_manager, properties=None):
         self.event_manager = event_manager
+        self.properties = properties or {}
         self._undo_stack: List[ActionStack] = []
         self._redo_stack: List[ActionStack] = []
-        self._stack_depth = 20
         self._current_transaction = None
 
         event_manager.subscribe(self.reset)
@@ -127,11 +209,25 @@ class UndoManager(Service, ActionProvider):
 
     def add_undo_action(self, action):
         """Add an action to undo."""
+        self.add_undo_record((CALL, action))
+
+    def add_undo_record(self, record):
+        """Add an undo record, a tuple of an opcode and its arguments."""
         if self._current_transaction:
-            self._current_transaction.add(action)
+            self._current_transaction.add(record)
             # TODO: should this be placed here?
             self._action_executed()
 
+    def _trim(self, stack):
+        """Drop the oldest transactions from the stack, if it's too big."""
+        depth = self.properties.get("undo-stack-depth", DEFAULT_STACK_DEPTH)
+        max_size = self.properties.get("undo-stack-size", DEFAULT_STACK_SIZE)
+        if len(stack) > depth:
+            del stack[: len(stack) - depth]
+        size = sum(tx.size for tx in stack)
+        while size > max_size and len(stack) > 1:
+            size -= stack.pop(0).size
+
     @event_handler(TransactionCommit)
     def commit_transaction(self, event=None):
         assert self._current_transaction
@@ -139,8 +235,7 @@ class UndoManager(Service, ActionProvider):
         if self._current_transaction.can_execute():
             self.clear_redo_stack()
             self._undo_stack.append(self._current_transaction)
-            while len(self._undo_stack) > self._stack_depth:
-                del self._undo_stack[0]
+            self._trim(self._undo_stack)
 
         self._current_transaction = None
 
@@ -159,7 +254,7 @@ class UndoManager(Service, ActionProvider):
         try:
             with Transaction(self.event_manager):
                 try:
-                    erroneous_tx.execute()
+                    erroneous_tx.execute(self.event_manager)
                 except Exception as e:
                     logger.error("Could not roolback transaction")
                     logger.error(e)
@@ -192,7 +287,7 @@ class UndoManager(Service, ActionProvider):
 
         try:
             with Transaction(self.event_manager):
-                transaction.execute()
+                transaction.execute(self.event_manager)
         finally:
             # Restore stacks and put latest tx on the redo stack
             self._redo_stack = redo_stack
@@ -200,8 +295,7 @@ class UndoManager(Service, ActionProvider):
                 self._redo_stack.extend(self._undo_stack)
             self._undo_stack = undo_stack
 
-        while len(self._redo_stack) > self._stack_depth:
-            del self._redo_stack[0]
+        self._trim(self._redo_stack)
 
         self._action_executed()
 
@@ -218,7 +312,7 @@ class UndoManager(Service, ActionProvider):
         redo_stack = list(self._redo_stack)
         try:
             with Transaction(self.event_manager):
-                transaction.execute()
+                transaction.execute(self.event_manager)
         finally:
             self._redo_stack = redo_stack
 
@@ -243,7 +337,7 @@ class UndoManager(Service, ActionProvider):
     #
 
     def _gaphas_undo_handler(self, event):
-        self.add_undo_action(lambda: state.saveapply(*event))
+        self.add_undo_record((GAPHAS, *event))
 
     def _register_undo_handlers(self):
 
@@ -279,81 +373,41 @@ class UndoManager(Service, ActionProvider):
 
     @event_handler(ElementCreated)
     def undo_create_event(self, event):
-        factory = event.service
-        element = event.element
-
-        def _undo_create_event():
-            try:
-                del factory._elements[element.id]
-            except KeyError:
-                pass  # Key was probably already removed in an unlink call
-            self.event_manager.handle(ElementDeleted(factory, element))
-
-        self.add_undo_action(_undo_create_event)
+        self.add_undo_record((CREATE, event.service, event.element))
 
     @event_handler(ElementDeleted)
     def undo_delete_event(self, event):
-        factory = event.service
-        element = event.element
-
-        def _undo_delete_event():
-            factory._elements[element.id] = element
-            self.event_manager.handle(ElementCreated(factory, element))
-
-        self.add_undo_action(_undo_delete_event)
+        self.add_undo_record((DELETE, event.service, event.element))
 
     @event_handler(AttributeUpdated)
     def undo_attribute_change_event(self, event):
-        attribute = event.property
-        element = event.element
-        value = event.old_value
-
-        def _undo_attribute_change_event():
-            attribute._set(element, value)
-
-        self.add_undo_action(_undo_attribute_change_event)
+        self.add_undo_record(
+            (ATTRIBUTE, event.property, event.element, event.old_value)
+        )
 
     @event_handler(AssociationSet)
     def undo_association_set_event(self, event):
         association = event.property
         if type(association) is not association_property:
             return
-        element = event.element
-        value = event.old_value
-
-        def _undo_association_set_event():
-            # Tell the association it should not need to let the opposite
-            # side connect (it has it's own signal)
-            association._set(element, value, from_opposite=True)
-
-        self.add_undo_action(_undo_association_set_event)
+        self.add_undo_record(
+            (ASSOCIATION_SET, association, event.element, event.old_value)
+        )
 
     @event_handler(AssociationAdded)
     def undo_association_add_event(self, event):
         association = event.property
         if type(association) is not association_property:
             return
-        element = event.element
-        value = event.new_value
-
-        def _undo_association_add_event():
-            # Tell the association it should not need to let the opposite
-            # side connect (it has it's own signal)
-            association._del(element, value, from_opposite=True)
-
-        self.add_undo_action(_undo_association_add_event)
+        self.add_undo_record(
+            (ASSOCIATION_DEL, association, event.element, event.new_value)
+        )
 
     @event_handler(AssociationDeleted)
     def undo_association_delete_event(self, event):
         association = event.property
         if type(association) is not association_property:
             return
-        element = event.element
-        value = event.old_value
-
-        def _undo_association_delete_event():
-            # Tell the assoctaion it should not need to let the opposite
-            # side connect (it has it's own signal)
-            association._set(element, value, from_opposite=True)
-
-        self.add_undo_action(_undo_association_delete_event)
+        self.add_undo_record(
+            (ASSOCIATION_SET, association, event.element, event.old_value)
+        )
@@ -0,0 +1,450 @@
+"""Load and save Gaphor models in a compact binary format.
+
+The binary format holds the same information as the XML format written by
+:mod:`gaphor.storage.storage`, but it is smaller and faster to read and
+write. A file consists of a header and a sequence of element records:
+
+    header:   MAGIC, format version (varint), Gaphor version (string)
+    record:   ELEMENT, payload length (varint), payload
+    trailer:  END
+
+An element payload contains the element type and id, followed by the
+number of fields and the fields themselves. A field is a name, a type tag
+and the encoded value. Diagrams store their canvas items as a (nested)
+field of type CANVAS.
+
+Strings, such as class names, property names and ids, are interned: the
+first occurrence is written in full and is assigned the next free index in
+the string table. Later occurrences refer to that index. Long text values
+are written inline, so they do not end up in the string table.
+
+Loading produces the same data structures as
+:class:`gaphor.storage.parser.GaphorLoader`, so the model is created by
+the same code that is used for XML files.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import struct
+from collections import OrderedDict
+from typing import IO, Dict, List, Optional, Tuple, Union, cast
+
+import gaphas
+
+from gaphor import application
+from gaphor.core.modeling import Element
+from gaphor.core.modeling.collection import collection
+from gaphor.storage import parser
+
+__all__ = [
+    "save",
+    "save_generator",
+    "parse",
+    "parse_generator",
+    "is_binary",
+    "BinaryLoader",
+    "BinaryFormatError",
+]
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"GAPHORB\x00"
+FILE_FORMAT_VERSION = 1
+
+# Record tags
+END = 0x00
+ELEMENT = 0x01
+
+# Value tags
+STRING = 0x01
+TEXT = 0x02
+TRUE = 0x03
+FALSE = 0x04
+INT = 0x05
+FLOAT = 0x06
+REF = 0x07
+REFLIST = 0x08
+CANVAS = 0x09
+
+# Strings longer than this are written inline, not interned.
+MAX_INTERN_LENGTH = 64
+
+_double = struct.Struct("<d")
+
+
+class BinaryFormatError(parser.ParserException):
+    pass
+
+
+# Errors raised while reading malformed data
+DECODE_ERRORS = (IndexError, UnicodeDecodeError, struct.error)
+
+
+def is_binary(filename) -> bool:
+    """Check if the file (a file name or an open binary file) contains a
+    binary model."""
+    if isinstance(filename, io.TextIOBase):
+        return False
+    head: bytes
+    if isinstance(filename, io.IOBase):
+        pos = filename.tell()
+        head = filename.read(len(MAGIC))
+        filename.seek(pos, os.SEEK_SET)
+    else:
+        try:
+            with open(filename, "rb") as f:
+                head = f.read(len(MAGIC))
+        except OSError:
+            return False
+    return head == MAGIC
+
+
+class Encoder:
+    """Write primitives to a buffer, interning strings on the way."""
+
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+
+    def varint(self, buf: bytearray, n: int) -> None:
+        while n > 0x7F:
+            buf.append((n & 0x7F) | 0x80)
+            n >>= 7
+        buf.append(n)
+
+    def text(self, buf: bytearray, s: str) -> None:
+        data = s.encode("utf-8")
+        self.varint(buf, len(data))
+        buf += data
+
+    def string(self, buf: bytearray, s: str) -> None:
+        """Write a string reference.
+
+        Index 0 means a new string follows, other values refer to
+        ``strings[index - 1]``.
+        """
+        index = self.strings.get(s)
+        if index is None:
+            self.strings[s] = len(self.strings) + 1
+            buf.append(0)
+            self.text(buf, s)
+        else:
+            self.varint(buf, index)
+
+
+def save(out, factory, status_queue=None):
+    for status in save_generator(out, factory):
+        if status_queue:
+            status_queue(status)
+
+
+def save_generator(out, factory):
+    """Save the model in ``factory`` to ``out``, a file opened in binary
+    mode."""
+    from gaphor.storage import storage
+
+    enc = Encoder()
+
+    header = bytearray(MAGIC)
+    enc.varint(header, FILE_FORMAT_VERSION)
+    enc.text(header, application.distribution().version)
+    out.write(header)
+
+    storage.load_canvases(factory)
+
+    size = factory.size()
+    for n, e in enumerate(factory.values(), start=1):
+        out.write(write_element(enc, e))
+
+        if n % 25 == 0:
+            yield (n * 100) / size
+
+    out.write(bytes((END,)))
+
+
+def write_element(enc: Encoder, element: Element) -> bytearray:
+    """Return the (length prefixed) record for an element."""
+    assert element.id
+    payload = bytearray()
+    enc.string(payload, element.__class__.__name__)
+    enc.string(payload, cast(str, element.id))
+    write_fields(enc, payload, element.save)
+
+    record = bytearray((ELEMENT,))
+    enc.varint(record, len(payload))
+    record += payload
+    return record
+
+
+def write_fields(enc: Encoder, buf: bytearray, save) -> None:
+    """Write the fields of an element or canvas item.
+
+    ``save`` is the element's save method. The field count is written
+    first, hence fields are collected in a separate buffer.
+    """
+    fields = bytearray()
+    count = 0
+
+    def save_func(name, value):
+        nonlocal count
+        if write_field(enc, fields, name, value):
+            count += 1
+
+    save(save_func)
+    enc.varint(buf, count)
+    buf += fields
+
+
+def write_field(enc: Encoder, buf: bytearray, name: str, value) -> bool:
+    """Write a single field, return ``False`` if nothing has been written.
+
+    The same rules as for the XML format apply: references to elements
+    without id and empty collections are not saved.
+    """
+    if isinstance(value, (Element, gaphas.Item)):
+        if not value.id:
+            return False
+        enc.string(buf, name)
+        buf.append(REF)
+        enc.string(buf, value.id)
+    elif isinstance(value, collection):
+        ids = [v.id for v in value if v.id]
+        if not ids:
+            return False
+        enc.string(buf, name)
+        buf.append(REFLIST)
+        enc.varint(buf, len(ids))
+        for id in ids:
+            enc.string(buf, id)
+    elif isinstance(value, gaphas.Canvas):
+        enc.string(buf, name)
+        buf.append(CANVAS)
+        write_canvas_items(enc, buf, value, value.get_root_items())
+    elif value is None:
+        return False
+    else:
+        enc.string(buf, name)
+        write_value(enc, buf, value)
+    return True
+
+
+def write_value(enc: Encoder, buf: bytearray, value) -> None:
+    if value is True:
+        buf.append(TRUE)
+    elif value is False:
+        buf.append(FALSE)
+    elif type(value) is int:
+        buf.append(INT)
+        # zig-zag encoding, so small negative numbers stay small
+        enc.varint(buf, value << 1 if value >= 0 else (-value << 1) - 1)
+    elif type(value) is float:
+        buf.append(FLOAT)
+        buf += _double.pack(value)
+    else:
+        s = str(value)
+        if len(s) > MAX_INTERN_LENGTH:
+            buf.append(TEXT)
+            enc.text(buf, s)
+        else:
+            buf.append(STRING)
+            enc.string(buf, s)
+
+
+def write_canvas_items(enc: Encoder, buf: bytearray, canvas, items) -> None:
+    enc.varint(buf, len(items))
+    for item in items:
+        enc.string(buf, item.id)
+        enc.string(buf, item.__class__.__name__)
+        write_fields(enc, buf, item.save)
+        write_canvas_items(enc, buf, canvas, canvas.get_children(item))
+
+
+class BinaryLoader:
+    """Create a dictionary of elements and canvas items from a binary model.
+
+    It exposes the same attributes as
+    :class:`gaphor.storage.parser.GaphorLoader`.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.gaphor_version: Optional[str] = None
+        self.elements: Dict[
+            str, Union[parser.element, parser.canvasitem]
+        ] = OrderedDict()
+        self.strings: List[str] = []
+        self.data: bytes = b""
+        self.pos = 0
+
+    def varint(self) -> int:
+        data = self.data
+        pos = self.pos
+        b = data[pos]
+        pos += 1
+        if b < 0x80:
+            self.pos = pos
+            return b
+        n = b & 0x7F
+        shift = 7
+        while True:
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                self.pos = pos
+                return n
+            shift += 7
+
+    def text(self) -> str:
+        length = self.varint()
+        start = self.pos
+        self.pos = end = start + length
+        return self.data[start:end].decode("utf-8")
+
+    def string(self) -> str:
+        index = self.varint()
+        if index:
+            return self.strings[index - 1]
+        s = self.text()
+        self.strings.append(s)
+        return s
+
+    def read_header(self, data: bytes) -> None:
+        if not data.startswith(MAGIC):
+            raise BinaryFormatError("Not a binary Gaphor model")
+        self.data = data
+        self.pos = len(MAGIC)
+        try:
+            self.version = self.varint()
+            if self.version != FILE_FORMAT_VERSION:
+                raise BinaryFormatError(
+                    f"Unsupported binary file format version {self.version}"
+                )
+            self.gaphor_version = self.text()
+        except DECODE_ERRORS as e:
+            raise BinaryFormatError(f"File corrupt: invalid header ({e})") from e
+
+    def read_records(self):
+        """Read element records, yield after each record."""
+        while True:
+            start = self.pos
+            try:
+                if not self.read_next_record():
+                    return
+            except DECODE_ERRORS as e:
+                raise BinaryFormatError(
+                    f"File corrupt: invalid record at offset {start} ({e})"
+                ) from e
+            yield
+
+    def read_next_record(self) -> bool:
+        """Read a record, return ``False`` at the end of the file."""
+        data = self.data
+        try:
+            tag = data[self.pos]
+        except IndexError:
+            raise BinaryFormatError("Unexpected end of file")
+        self.pos += 1
+        if tag == END:
+            return False
+        length = self.varint()
+        end = self.pos + length
+        if end > len(data):
+            raise BinaryFormatError("Unexpected end of file")
+        self.read_record(tag)
+        if self.pos != end:
+            raise BinaryFormatError("Record size does not match its content")
+        return True
+
+    def read_record(self, tag: int) -> None:
+        if tag == ELEMENT:
+            self.read_element()
+        else:
+            raise BinaryFormatError(f"Invalid record type {tag}")
+
+    def read_element(self) -> None:
+        type = self.string()
+        id = self.string()
+        e = parser.element(id, type)
+        if id in self.elements:
+            log.exception(
+                f"File corrupt: duplicate element. Remove element {type} with id {id} and try again"
+            )
+        self.elements[id] = e
+        self.read_fields(e)
+
+    def read_fields(self, obj: Union[parser.element, parser.canvasitem]) -> None:
+        data = self.data
+        for _ in range(self.varint()):
+            name = self.string()
+            tag = data[self.pos]
+            self.pos += 1
+            if tag == STRING:
+                obj.values[name] = self.string()
+            elif tag == TEXT:
+                obj.values[name] = self.text()
+            elif tag == TRUE:
+                obj.values[name] = "1"
+            elif tag == FALSE:
+                obj.values[name] = "0"
+            elif tag == INT:
+                n = self.varint()
+                obj.values[name] = str(n >> 1 if not n & 1 else -((n + 1) >> 1))
+            elif tag == FLOAT:
+                (f,) = _double.unpack_from(data, self.pos)
+                self.pos += _double.size
+                obj.values[name] = str(f)
+            elif tag == REF:
+                obj.references[name] = self.string()
+            elif tag == REFLIST:
+                obj.references[name] = [self.string() for _ in range(self.varint())]
+            elif tag == CANVAS and isinstance(obj, parser.element):
+                obj.canvas = parser.canvas(self.read_canvas_items())
+            else:
+                raise BinaryFormatError(f"Invalid value type {tag} for {name}")
+
+    def read_canvas_items(self) -> List[parser.canvasitem]:
+        items = []
+        for _ in range(self.varint()):
+            id = self.string()
+            ci = parser.canvasitem(id, self.string())
+            assert id not in self.elements, f"{id} already defined"
+            self.elements[id] = ci
+            self.read_fields(ci)
+            ci.canvasitems = self.read_canvas_items()
+            items.append(ci)
+        return items
+
+
+def parse_generator(filename, loader: BinaryLoader):
+    """Parse a binary model file and load it in ``loader``.
+
+    The filename parameter can be an open binary file or the name of a
+    file. The percentage of the file read is yielded.
+    """
+    assert isinstance(loader, BinaryLoader), "loader should be a BinaryLoader"
+
+    if isinstance(filename, io.IOBase):
+        file_obj: Union[IO, io.IOBase] = filename
+        data = file_obj.read()
+    else:
+        with open(filename, "rb") as file_obj:
+            data = file_obj.read()
+
+    loader.read_header(data)
+    size = len(data)
+    for n, _ in enumerate(loader.read_records(), start=1):
+        if n % 100 == 0:
+            yield (loader.pos * 100) / size
+    yield 100
+
+
+def parse(filename) -> Tuple[Optional[str], Dict]:
+    """Parse a binary model file and return its Gaphor version and a
+    dictionary ID:element/canvasitem."""
+    loader = BinaryLoader()
+    for _ in parse_generator(filename, loader):
+        pass
+    return loader.gaphor_version, loader.elements
@@ -0,0 +1,335 @@
+"""Incremental saving of models by means of an append-only journal.
+
+A model is stored as a snapshot (a regular model file, XML or binary) plus
+a sidecar journal file (``<model file>.journal``). The journal contains
+blocks of records that describe the state of elements that changed after
+the snapshot was written:
+
+    header:   JOURNAL_MAGIC, format version (varint),
+              snapshot size (varint), snapshot modification time (varint)
+    block:    BLOCK, payload length (varint), payload
+
+A block payload is a sequence of records, terminated by END. Records are
+either ELEMENT records, as used by the binary format
+(:mod:`gaphor.storage.binary`), or DELETE records, containing the id of a
+removed element. Each block has its own string table.
+
+The journal records element state, not the changes themselves. When a
+diagram item changes, the whole diagram, including the canvas, is written.
+
+When a model is loaded with journaling enabled, the journal is applied to
+the parsed snapshot, before the model is created. A journal that does not match the snapshot is
+ignored, as is a partially written block at the end of the journal.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Dict, Iterable, Set, Union
+
+from gaphas import state
+
+from gaphor.core import event_handler
+from gaphor.core.modeling import Diagram, Presentation
+from gaphor.core.modeling.event import (
+    AssociationUpdated,
+    AttributeUpdated,
+    DerivedUpdated,
+    DiagramItemCreated,
+    DiagramItemDeleted,
+    ElementCreated,
+    ElementDeleted,
+    ModelReady,
+)
+from gaphor.event import TransactionBegin, TransactionCommit
+from gaphor.storage import binary, parser
+
+__all__ = ["Journal", "apply_journal", "journal_filename", "remove_journal"]
+
+log = logging.getLogger(__name__)
+
+JOURNAL_MAGIC = b"GAPHORJ\x00"
+JOURNAL_FORMAT_VERSION = 1
+
+# Block and record tags, in addition to the ones from the binary format
+BLOCK = 0x10
+DELETE = 0x11
+
+# Compact (do a full save) if the journal grows beyond this ratio of the
+# snapshot size.
+COMPACT_RATIO = 0.5
+
+
+def journal_filename(filename):
+    """Return the name of the journal file for a model file."""
+    filename = os.fspath(filename)
+    return filename + (b".journal" if isinstance(filename, bytes) else ".journal")
+
+
+def remove_journal(filename) -> None:
+    """Remove the journal for a model file, if there is one."""
+    try:
+        os.remove(journal_filename(filename))
+    except FileNotFoundError:
+        pass
+
+
+def _snapshot_header(filename) -> bytearray:
+    st = os.stat(filename)
+    enc = binary.Encoder()
+    header = bytearray(JOURNAL_MAGIC)
+    enc.varint(header, JOURNAL_FORMAT_VERSION)
+    enc.varint(header, st.st_size)
+    enc.varint(header, st.st_mtime_ns)
+    return header
+
+
+def journal_matches(filename) -> bool:
+    """Check if the journal belongs to the current snapshot.
+
+    Returns ``True`` if there is no journal file, since a new journal can
+    be started.
+    """
+    header = _snapshot_header(filename)
+    try:
+        with open(journal_filename(filename), "rb") as f:
+            return f.read(len(header)) == header
+    except FileNotFoundError:
+        return True
+
+
+def discard_element(elements: Dict, id: str) -> None:
+    """Remove a parsed element, including its canvas items."""
+
+    def discard_canvasitems(canvasitems):
+        for item in canvasitems:
+            elements.pop(item.id, None)
+            discard_canvasitems(item.canvasitems)
+
+    old = elements.pop(id, None)
+    if isinstance(old, parser.element) and old.canvas:
+        discard_canvasitems(old.canvas.canvasitems)
+
+
+class JournalReader(binary.BinaryLoader):
+    """Apply journal records to a dictionary of parsed elements."""
+
+    def __init__(self, elements: Dict[str, Union[parser.element, parser.canvasitem]]):
+        super().__init__()
+        self.elements = elements
+
+    def read_element(self) -> None:
+        type = self.string()
+        id = self.string()
+        discard_element(self.elements, id)
+        e = parser.element(id, type)
+        self.elements[id] = e
+        self.read_fields(e)
+
+    def read_record(self, tag: int) -> None:
+        if tag == DELETE:
+            discard_element(self.elements, self.string())
+        else:
+            super().read_record(tag)
+
+    def read_blocks(self, data: bytes, header: bytes) -> int:
+        """Read all complete blocks, return the number of blocks read."""
+        if not data.startswith(header):
+            log.warning("Journal does not match the model file, it is ignored")
+            return 0
+
+        self.data = data
+        self.pos = len(header)
+        blocks = 0
+        while self.pos < len(data):
+            if data[self.pos] != BLOCK:
+                raise binary.BinaryFormatError("Invalid journal block")
+            self.pos += 1
+            try:
+                length = self.varint()
+            except IndexError:
+                length = len(data)
+            if self.pos + length > len(data):
+                log.warning("Journal ends with an incomplete block, it is ignored")
+                break
+            self.strings = []
+            for _ in self.read_records():
+                pass
+            blocks += 1
+        return blocks
+
+
+def apply_journal(filename, elements: Dict) -> int:
+    """Apply the journal of ``filename`` to the parsed elements.
+
+    Returns the number of blocks applied.
+    """
+    try:
+        with open(journal_filename(filename), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return 0
+
+    blocks = JournalReader(elements).read_blocks(data, _snapshot_header(filename))
+    log.info(f"Applied {blocks} journal blocks")
+    return blocks
+
+
+class Journal:
+    """Keep track of changed elements, so they can be appended to a
+    journal.
+
+    The journal listens to the same events as the undo manager. Changes
+    to diagram items are recorded on their diagram. Changes that are only
+    visible through Gaphas (such as moving an item) are picked up on
+    transaction commit, through the diagram canvas' ``modified`` flag.
+    """
+
+    def __init__(self, event_manager, element_factory):
+        self.event_manager = event_manager
+        self.element_factory = element_factory
+        self._changed: Set[str] = set()
+        self._canvas_changed = False
+
+        event_manager.subscribe(self._on_model_ready)
+        event_manager.subscribe(self._on_element_created)
+        event_manager.subscribe(self._on_element_deleted)
+        event_manager.subscribe(self._on_element_updated)
+        event_manager.subscribe(self._on_diagram_item_changed)
+        event_manager.subscribe(self._on_transaction_begin)
+        event_manager.subscribe(self._on_transaction_commit)
+        state.subscribers.add(self._on_gaphas_change)
+
+    def shutdown(self):
+        self.event_manager.unsubscribe(self._on_model_ready)
+        self.event_manager.unsubscribe(self._on_element_created)
+        self.event_manager.unsubscribe(self._on_element_deleted)
+        self.event_manager.unsubscribe(self._on_element_updated)
+        self.event_manager.unsubscribe(self._on_diagram_item_changed)
+        self.event_manager.unsubscribe(self._on_transaction_begin)
+        self.event_manager.unsubscribe(self._on_transaction_commit)
+        state.subscribers.discard(self._on_gaphas_change)
+
+    @property
+    def changed(self) -> bool:
+        """Are there any changes to be appended to the journal?"""
+        return bool(self._changed)
+
+    def reset(self) -> None:
+        """Forget all changes, e.g. after the full model has been saved."""
+        self._changed.clear()
+        self._canvas_changed = False
+        for diagram in self.element_factory.select(Diagram):
+            if diagram.canvas_loaded:
+                diagram.canvas.modified = False
+
+    def can_append(self, filename) -> bool:
+        """Check if changes can be appended to the journal of ``filename``.
+
+        If the journal has grown too big, a full save is preferred.
+        """
+        try:
+            snapshot_size = os.path.getsize(filename)
+        except OSError:
+            return False
+        try:
+            journal_size = os.path.getsize(journal_filename(filename))
+        except OSError:
+            journal_size = 0
+        return journal_size <= snapshot_size * COMPACT_RATIO and journal_matches(
+            filename
+        )
+
+    def append(self, filename) -> None:
+        for _ in self.append_generator(filename):
+            pass
+
+    def append_generator(self, filename):
+        """Append a block with all changed elements to the journal."""
+        self._collect_modified_diagrams()
+        if not self._changed:
+            yield 100
+            return
+
+        journal = journal_filename(filename)
+        header = b"" if os.path.exists(journal) else _snapshot_header(filename)
+        changed = list(self._changed)
+        payload = bytearray()
+        enc = binary.Encoder()
+
+        for n, id in enumerate(changed, start=1):
+            payload += self._record(enc, id)
+            if n % 25 == 0:
+                yield (n * 100) / len(changed)
+        payload.append(binary.END)
+
+        block = bytearray(header)
+        block.append(BLOCK)
+        enc.varint(block, len(payload))
+        block += payload
+        with open(journal, "ab") as out:
+            out.write(block)
+            out.flush()
+            os.fsync(out.fileno())
+
+        self._changed.difference_update(changed)
+        yield 100
+
+    def _record(self, enc: binary.Encoder, id: str) -> bytearray:
+        element = self.element_factory.lookup(id)
+        if element is not None:
+            return binary.write_element(enc, element)
+        payload = bytearray()
+        enc.string(payload, id)
+        record = bytearray((DELETE,))
+        enc.varint(record, len(payload))
+        record += payload
+        return record
+
+    def _mark(self, elements: Iterable) -> None:
+        for element in elements:
+            if isinstance(element, Presentation):
+                element = element.diagram
+            if element is not None and element.id:
+                self._changed.add(element.id)
+
+    @event_handler(ModelReady)
+    def _on_model_ready(self, event):
+        self.reset()
+
+    @event_handler(ElementCreated)
+    def _on_element_created(self, event):
+        self._mark((event.element,))
+
+    @event_handler(ElementDeleted)
+    def _on_element_deleted(self, event):
+        self._changed.add(event.element.id)
+
+    @event_handler(AttributeUpdated, AssociationUpdated)
+    def _on_element_updated(self, event):
+        if not isinstance(event, DerivedUpdated):
+            self._mark((event.element,))
+
+    @event_handler(DiagramItemCreated, DiagramItemDeleted)
+    def _on_diagram_item_changed(self, event):
+        self._mark((event.diagram,))
+
+    def _on_gaphas_change(self, event):
+        self._canvas_changed = True
+
+    @event_handler(TransactionBegin)
+    def _on_transaction_begin(self, event):
+        self._canvas_changed = False
+
+    @event_handler(TransactionCommit)
+    def _on_transaction_commit(self, event):
+        if self._canvas_changed:
+            self._collect_modified_diagrams()
+
+    def _collect_modified_diagrams(self):
+        self._canvas_changed = False
+        for diagram in self.element_factory.select(Diagram):
+            if diagram.canvas_loaded and diagram.canvas.modified:
+                diagram.canvas.modified = False
+                self._changed.add(diagram.id)
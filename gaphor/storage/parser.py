@@ -163,7 +163,7 @@ class GaphorLoader(handler.ContentHandler):
         self.gaphor_version = None
         self.elements: Dict[str, Union[element, canvasitem]] = OrderedDict()
         self._stack: List[Tuple[Union[element, canvas, canvasitem], State]] = []
-        self.text = ""
+        self.text: List[str] = []
         self._start_element_handlers = (
             self.start_element,
             self.start_canvas,
@@ -180,7 +180,7 @@ class GaphorLoader(handler.ContentHandler):
             raise ParserException("Invalid XML document.")
 
     def startElement(self, name, attrs):
-        self.text = ""
+        self.text = []
 
         state = self.state()
 
@@ -282,7 +282,7 @@ class GaphorLoader(handler.ContentHandler):
             # Two levels up: the attribute name
             n = self.peek(2)
             # Three levels up: the element instance (element or canvasitem)
-            self.peek(3).values[n] = self.text
+            self.peek(3).values[n] = "".join(self.text)
         self.pop()
 
     def startElementNS(self, name, qname, attrs):
@@ -297,8 +297,12 @@ class GaphorLoader(handler.ContentHandler):
             self.endElement(name[1])
 
     def characters(self, content):
-        """Read characters."""
-        self.text = self.text + content
+        """Read characters.
+
+        Text is collected in a list and joined once the element ends,
+        so long values are not copied on every chunk.
+        """
+        self.text.append(content)
 
 
 def parse(filename):
@@ -326,6 +330,14 @@ def parse_generator(filename, loader):
     yield from parse_file(filename, parser)
 
 
+# Smallest block fed to the parser at once.
+MIN_BLOCK_SIZE = 64 * 1024
+
+# Number of progress updates aimed for when the block size is determined
+# from the file size.
+PROGRESS_STEPS = 100
+
+
 class ProgressGenerator:
     """A generator that yields the progress of taking from a file input object
     and feeding it into an output object.
@@ -335,24 +347,29 @@ class ProgressGenerator:
     reading and that it will be closed elsewhere.
     """
 
-    def __init__(self, input, output, block_size=512):
+    def __init__(self, input, output, block_size=None):
         """Initialize the progress generator.
 
         The input parameter is a file object.  The output parameter is
         usually a SAX parser but can be anything that implements a
         feed() method.  The block size is the size of each block that is
-        read from the input.
+        read from the input. If no block size is provided, it is derived
+        from the file size: at least ``MIN_BLOCK_SIZE``, and large enough
+        to read the file in about ``PROGRESS_STEPS`` blocks.
         """
 
         self.input = input
         self.output = output
-        self.block_size = block_size
+        self.file_size = 0
         if isinstance(self.input, io.IOBase):
             orig_pos = self.input.tell()
             self.file_size = self.input.seek(0, 2)
             self.input.seek(orig_pos, os.SEEK_SET)
         elif isinstance(self.input, str):
             self.file_size = len(self.input)
+        self.block_size = block_size or max(
+            MIN_BLOCK_SIZE, self.file_size // PROGRESS_STEPS
+        )
 
     def __iter__(self):
         """Return a generator that yields the progress of reading data from the
@@ -369,7 +386,7 @@ class ProgressGenerator:
             self.output.feed(block)
             block = self.input.read(self.block_size)
             read_size += len(block)
-            yield (read_size * 100) / self.file_size
+            yield (read_size * 100) / self.file_size if self.file_size else 100
 
 
 def parse_file(filename, parser):
@@ -2,6 +2,10 @@
 
 Three functions are exported: load(filename)     load a model from a
 file save(filename)     store the current model in a file
+
+Models stored in the binary format (see gaphor.storage.binary) are
+recognized and loaded as well. A journal for a model file (see
+gaphor.storage.journal) can be applied on load.
 """
 
 __all__ = ["load", "save"]
@@ -10,14 +14,17 @@ import io
 import logging
 import os.path
 import uuid
+from contextlib import contextmanager
 from functools import partial
+from typing import Dict, Set, Union, cast
 
 import gaphas
+from gaphas import state
 
 from gaphor import application
 from gaphor.core.modeling import Diagram, Element
 from gaphor.core.modeling.collection import collection
-from gaphor.storage import parser
+from gaphor.storage import binary, journal, parser
 
 FILE_FORMAT_VERSION = "3.0"
 NAMESPACE_MODEL = "http://gaphor.sourceforge.net/model"
@@ -46,6 +53,8 @@ def save_generator(writer, factory):
         },
     )
 
+    load_canvases(factory)
+
     size = factory.size()
     for n, e in enumerate(factory.values(), start=1):
         clazz = e.__class__.__name__
@@ -62,6 +71,16 @@ def save_generator(writer, factory):
     writer.endDocument()
 
 
+def load_canvases(factory):
+    """Load the items of lazily loaded diagrams.
+
+    Diagram items refer to model elements, so all items should be there
+    before the model is saved.
+    """
+    for diagram in factory.lselect(Diagram):
+        diagram.load_canvas()
+
+
 def save_element(name, value, writer):
     """Save attributes and references from items in the gaphor.UML module.
 
@@ -145,16 +164,24 @@ def save_element(name, value, writer):
         save_value(name, value)
 
 
-def load_elements(elements, factory, modeling_language, gaphor_version="1.0.0"):
+def load_elements(
+    elements, factory, modeling_language, gaphor_version="1.0.0", lazy_diagrams=False
+):
     for _ in load_elements_generator(
-        elements, factory, modeling_language, gaphor_version
+        elements, factory, modeling_language, gaphor_version, lazy_diagrams
     ):
         pass
 
 
-def load_elements_generator(elements, factory, modeling_language, gaphor_version):
+def load_elements_generator(
+    elements, factory, modeling_language, gaphor_version, lazy_diagrams=False
+):
     """Load a file and create a model if possible.
 
+    If ``lazy_diagrams`` is set, diagram items are not created right away.
+    The parsed canvas is kept with the diagram, and the items are created
+    when the diagram's canvas is first accessed.
+
     Exceptions: IOError, ValueError.
     """
     log.debug(f"Loading {len(elements)} elements")
@@ -170,43 +197,81 @@ def load_elements_generator(elements, factory, modeling_language, gaphor_version
     # First create elements and canvas items in the factory
     # The elements are stored as attribute 'element' on the parser objects:
     yield from _load_elements_and_canvasitems(
-        elements, factory, modeling_language, gaphor_version, update_status_queue
+        elements,
+        factory,
+        modeling_language,
+        gaphor_version,
+        update_status_queue,
+        lazy_diagrams,
     )
     yield from _load_attributes_and_references(elements, update_status_queue)
 
     for d in factory.lselect(Diagram):
-        canvas = d.canvas
-        # update_now() is implicitly called when lock is released
-        canvas.block_updates = False
+        if d.canvas_loaded:
+            canvas = d.canvas
+            # update_now() is implicitly called when lock is released
+            canvas.block_updates = False
 
     # do a postload:
     for id, elem in list(elements.items()):
         yield from update_status_queue()
-        elem.element.postload()
+        if elem.element is not None:
+            elem.element.postload()
 
 
-def _load_elements_and_canvasitems(
-    elements, factory, modeling_language, gaphor_version, update_status_queue
+def _create_canvasitems(
+    diagram, canvasitems, elements, modeling_language, gaphor_version, parent=None
 ):
-    def create_canvasitems(diagram, canvasitems, parent=None):
-        """Canvas is a read gaphas.Canvas, items is a list of
-        parser.canvasitem's."""
+    """Create diagram items for a list of parser.canvasitem's.
+
+    New items are registered in ``elements``.
+    """
+    if version_lower_than(gaphor_version, (1, 1, 0)):
+        new_canvasitems = upgrade_message_item_to_1_1_0(canvasitems)
+        canvasitems.extend(new_canvasitems)
+        for item in new_canvasitems:
+            elements[item.id] = item
+
+    for item in canvasitems:
+        item = upgrade_canvas_item_to_1_0_2(item)
+        item = upgrade_canvas_item_to_1_3_0(item)
         if version_lower_than(gaphor_version, (1, 1, 0)):
-            new_canvasitems = upgrade_message_item_to_1_1_0(canvasitems)
-            canvasitems.extend(new_canvasitems)
-            for item in new_canvasitems:
-                elements[item.id] = item
+            item = upgrade_presentation_item_to_1_1_0(item)
+        cls = modeling_language.lookup_diagram_item(item.type)
+        assert cls, f"No diagram item for type {item.type}"
+        item.element = diagram.create_as(cls, item.id, parent=parent)
+        elements[item.id] = item
+        _create_canvasitems(
+            diagram,
+            item.canvasitems,
+            elements,
+            modeling_language,
+            gaphor_version,
+            parent=item.element,
+        )
+
+
+def _defer_canvasitems(canvasitems, subjects):
+    """Mark canvas items as not loaded (yet).
+
+    The ids of their subjects are added to ``subjects``.
+    """
+    for item in canvasitems:
+        item.element = None
+        subject = item.references.get("subject")
+        if isinstance(subject, str):
+            subjects.add(subject)
+        _defer_canvasitems(item.canvasitems, subjects)
 
-        for item in canvasitems:
-            item = upgrade_canvas_item_to_1_0_2(item)
-            item = upgrade_canvas_item_to_1_3_0(item)
-            if version_lower_than(gaphor_version, (1, 1, 0)):
-                item = upgrade_presentation_item_to_1_1_0(item)
-            cls = modeling_language.lookup_diagram_item(item.type)
-            assert cls, f"No diagram item for type {item.type}"
-            item.element = diagram.create_as(cls, item.id, parent=parent)
-            create_canvasitems(diagram, item.canvasitems, parent=item.element)
 
+def _load_elements_and_canvasitems(
+    elements,
+    factory,
+    modeling_language,
+    gaphor_version,
+    update_status_queue,
+    lazy_diagrams=False,
+):
     for id, elem in list(elements.items()):
         yield from update_status_queue()
         if isinstance(elem, parser.element):
@@ -218,8 +283,29 @@ def _load_elements_and_canvasitems(
             elem.element = factory.create_as(cls, id)
             if isinstance(elem.element, Diagram):
                 assert elem.canvas
-                elem.element.canvas.block_updates = True
-                create_canvasitems(elem.element, elem.canvas.canvasitems)
+                if lazy_diagrams:
+                    subjects: Set[str] = set()
+                    _defer_canvasitems(elem.canvas.canvasitems, subjects)
+                    elem.element.defer_canvas(
+                        partial(
+                            load_canvas,
+                            elem.element,
+                            elem.canvas,
+                            factory,
+                            modeling_language,
+                            gaphor_version,
+                        ),
+                        subjects,
+                    )
+                else:
+                    elem.element.canvas.block_updates = True
+                    _create_canvasitems(
+                        elem.element,
+                        elem.canvas.canvasitems,
+                        elements,
+                        modeling_language,
+                        gaphor_version,
+                    )
         elif not isinstance(elem, parser.canvasitem):
             raise ValueError(
                 f"Item with id {id} and type {type(elem)} can not be instantiated"
@@ -227,51 +313,143 @@ def _load_elements_and_canvasitems(
 
 
 def _load_attributes_and_references(elements, update_status_queue):
+    def resolve(refid):
+        return elements[refid].element
+
     for id, elem in list(elements.items()):
         yield from update_status_queue()
         # Ensure that all elements have their element instance ready...
         assert hasattr(elem, "element")
 
-        # load attributes and references:
-        for name, value in list(elem.values.items()):
-            elem.element.load(name, value)
-
-        for name, refids in list(elem.references.items()):
-            if isinstance(refids, list):
-                for refid in refids:
-                    try:
-                        ref = elements[refid]
-                    except ValueError:
-                        log.exception(
-                            f"Invalid ID for reference ({refid}) for element {elem.type}.{name}"
-                        )
-                    else:
-                        elem.element.load(name, ref.element)
-            else:
+        # Canvas items of lazily loaded diagrams are loaded later
+        if elem.element is not None:
+            _load_element(elem, resolve)
+
+
+def _load_element(elem, resolve):
+    """Load attributes and references of a parsed element.
+
+    ``resolve(refid)`` returns the referenced element. References that
+    resolve to ``None`` are skipped.
+    """
+    for name, value in list(elem.values.items()):
+        elem.element.load(name, value)
+
+    for name, refids in list(elem.references.items()):
+        if isinstance(refids, list):
+            refs = []
+            for refid in refids:
                 try:
-                    ref = elements[refids]
+                    ref = resolve(refid)
                 except ValueError:
-                    log.exception(f"Invalid ID for reference ({refids})")
+                    log.exception(
+                        f"Invalid ID for reference ({refid}) for element {elem.type}.{name}"
+                    )
                 else:
-                    elem.element.load(name, ref.element)
+                    if ref is not None:
+                        refs.append(ref)
+            if isinstance(elem, parser.element):
+                # Model elements load their references in bulk
+                cast(Element, elem.element).load_many(name, refs)
+            else:
+                # Diagram items may override load()
+                for ref in refs:
+                    elem.element.load(name, ref)
+        else:
+            try:
+                ref = resolve(refids)
+            except ValueError:
+                log.exception(f"Invalid ID for reference ({refids})")
+            else:
+                if ref is not None:
+                    elem.element.load(name, ref)
+
+
+@contextmanager
+def gaphas_state_suspended():
+    """Do not emit Gaphas state changes, so they do not end up in the undo
+    history.
+
+    Gaphas does not dispatch state changes while its mutex is held.
+    """
+    acquired = state.mutex.acquire(False)
+    try:
+        yield
+    finally:
+        if acquired:
+            state.mutex.release()
+
 
+def load_canvas(diagram, canvas, factory, modeling_language, gaphor_version):
+    """Create the diagram items of a lazily loaded diagram.
 
-def load(filename, factory, modeling_language, status_queue=None):
+    ``canvas`` is the parser.canvas of the diagram. Items whose subject
+    no longer exists are not created: they would have been removed
+    together with their subject.
+
+    Loading items is not a change to the model, hence neither events nor
+    Gaphas state changes are emitted.
+    """
+
+    def resolve(refid):
+        item = items.get(refid)
+        return item.element if item else factory.lookup(refid)
+
+    def is_orphan(item):
+        subject = item.references.get("subject")
+        return isinstance(subject, str) and factory.lookup(subject) is None
+
+    def prune(canvasitems):
+        canvasitems[:] = [item for item in canvasitems if not is_orphan(item)]
+        for item in canvasitems:
+            prune(item.canvasitems)
+
+    items: Dict[str, parser.canvasitem] = {}
+    with factory.block_events(), gaphas_state_suspended():
+        prune(canvas.canvasitems)
+        diagram.canvas.block_updates = True
+        _create_canvasitems(
+            diagram, canvas.canvasitems, items, modeling_language, gaphor_version
+        )
+        for item in items.values():
+            _load_element(item, resolve)
+        diagram.canvas.block_updates = False
+        for item in items.values():
+            item.element.postload()
+    diagram.canvas.modified = False
+
+
+def load(
+    filename,
+    factory,
+    modeling_language,
+    status_queue=None,
+    lazy_diagrams=False,
+    apply_journal=False,
+):
     """Load a file and create a model if possible.
 
     Optionally, a status queue function can be given, to which the
     progress is written (as status_queue(progress)).
     """
-    for status in load_generator(filename, factory, modeling_language):
+    for status in load_generator(
+        filename, factory, modeling_language, lazy_diagrams, apply_journal
+    ):
         if status_queue:
             status_queue(status)
 
 
-def load_generator(filename, factory, modeling_language):
+def load_generator(
+    filename, factory, modeling_language, lazy_diagrams=False, apply_journal=False
+):
     """Load a file and create a model if possible.
 
     This function is a generator. It will yield values from 0 to 100 (%)
     to indicate its progression.
+
+    If ``lazy_diagrams`` is set, diagram items are created when a diagram
+    is first used. If ``apply_journal`` is set, the journal of the model
+    file is applied.
     """
     if isinstance(filename, io.IOBase):
         log.info("Loading file from file descriptor")
@@ -279,8 +457,14 @@ def load_generator(filename, factory, modeling_language):
         log.info(f"Loading file {os.fsdecode(os.path.basename(filename))}")
     try:
         # Use the incremental parser and yield the percentage of the file.
-        loader = parser.GaphorLoader()
-        for percentage in parser.parse_generator(filename, loader):
+        loader: Union[binary.BinaryLoader, parser.GaphorLoader]
+        if binary.is_binary(filename):
+            loader = binary.BinaryLoader()
+            parsing = binary.parse_generator(filename, loader)
+        else:
+            loader = parser.GaphorLoader()
+            parsing = parser.parse_generator(filename, loader)
+        for percentage in parsing:
             if percentage:
                 yield percentage / 2
             else:
@@ -288,6 +472,9 @@ def load_generator(filename, factory, modeling_language):
         elements = loader.elements
         gaphor_version = loader.gaphor_version
 
+        if apply_journal and not isinstance(filename, io.IOBase):
+            journal.apply_journal(filename, elements)
+
     except OSError:
         log.exception("File could no be parsed")
         raise
@@ -303,7 +490,7 @@ def load_generator(filename, factory, modeling_language):
     with factory.block_events():
         try:
             for percentage in load_elements_generator(
-                elements, factory, modeling_language, gaphor_version
+                elements, factory, modeling_language, gaphor_version, lazy_diagrams
             ):
                 if percentage:
                     yield percentage / 2 + 50
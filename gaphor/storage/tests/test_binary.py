@@ -0,0 +1,117 @@
+import re
+from io import BytesIO, StringIO
+
+import pytest
+
+from gaphor import UML
+from gaphor.application import distribution
+from gaphor.storage import binary, storage
+from gaphor.storage.xmlwriter import XMLWriter
+
+
+def save_binary(element_factory):
+    out = BytesIO()
+    binary.save(out, element_factory)
+    return out.getvalue()
+
+
+def save_xml(element_factory):
+    out = StringIO()
+    storage.save(XMLWriter(out), element_factory)
+    return out.getvalue()
+
+
+def load(data, element_factory, modeling_language):
+    f = BytesIO(data) if isinstance(data, bytes) else StringIO(data)
+    storage.load(f, factory=element_factory, modeling_language=modeling_language)
+
+
+def test_binary_file_is_recognized(element_factory):
+    element_factory.create(UML.Package)
+
+    data = save_binary(element_factory)
+
+    assert data.startswith(binary.MAGIC)
+    assert binary.is_binary(BytesIO(data))
+    assert not binary.is_binary(StringIO(save_xml(element_factory)))
+
+
+def test_save_and_load_attributes_and_references(element_factory, modeling_language):
+    package = element_factory.create(UML.Package)
+    package.name = "Package with a rather long name that will not be interned " * 3
+    klass = element_factory.create(UML.Class)
+    klass.name = "Class"
+    klass.isAbstract = True
+    klass.package = package
+    prop = element_factory.create(UML.Property)
+    prop.name = "attr"
+    klass.ownedAttribute = prop
+
+    data = save_binary(element_factory)
+    load(data, element_factory, modeling_language)
+
+    package = element_factory.lselect(UML.Package)[0]
+    klass = element_factory.lselect(UML.Class)[0]
+    assert (
+        package.name == "Package with a rather long name that will not be interned " * 3
+    )
+    assert klass.name == "Class"
+    assert klass.isAbstract
+    assert klass.package is package
+    assert klass.ownedAttribute[0].name == "attr"
+
+
+def test_strings_are_interned(element_factory):
+    for _ in range(10):
+        c = element_factory.create(UML.Class)
+        c.name = "SameName"
+
+    data = save_binary(element_factory)
+
+    assert data.count(b"SameName") == 1
+
+
+def test_truncated_file_can_not_be_loaded(element_factory, modeling_language):
+    element_factory.create(UML.Package)
+    data = save_binary(element_factory)
+
+    with pytest.raises(binary.BinaryFormatError):
+        load(data[:-3], element_factory, modeling_language)
+
+
+def test_corrupt_record_can_not_be_loaded(element_factory):
+    element_factory.create(UML.Package).name = "Corrupt"
+    data = save_binary(element_factory).replace(b"Corrupt", b"\xff\xfeorrupt")
+
+    with pytest.raises(binary.BinaryFormatError):
+        binary.parse(BytesIO(data))
+
+
+def test_round_trip_to_xml(element_factory, modeling_language):
+    path = distribution().locate_file("test-models/simple-items.gaphor")
+    with open(path) as f:
+        orig = f.read()
+
+    load(orig, element_factory, modeling_language)
+    data = save_binary(element_factory)
+    load(data, element_factory, modeling_language)
+    copy = save_xml(element_factory)
+
+    expr = re.compile('gaphor-version="[^"]*"')
+    assert expr.sub("%VER%", copy) == expr.sub("%VER%", orig)
+
+
+def test_binary_model_is_smaller(element_factory, modeling_language):
+    path = distribution().locate_file("test-models/simple-items.gaphor")
+    with open(path) as f:
+        load(f.read(), element_factory, modeling_language)
+
+    assert len(save_binary(element_factory)) < len(save_xml(element_factory))
+
+
+def test_binary_model_is_less_than_half_the_size(element_factory, modeling_language):
+    path = distribution().locate_file("test-models/test-model.gaphor")
+    with open(path) as f:
+        load(f.read(), element_factory, modeling_language)
+
+    assert len(save_binary(element_factory)) < len(save_xml(element_factory)) / 2
@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import pytest
+
+from gaphor import UML
+from gaphor.core import Transaction
+from gaphor.storage import storage
+from gaphor.storage.journal import Journal, journal_filename
+from gaphor.storage.xmlwriter import XMLWriter
+
+
+@pytest.fixture
+def journal(event_manager, element_factory):
+    journal = Journal(event_manager, element_factory)
+    yield journal
+    journal.shutdown()
+
+
+@pytest.fixture
+def model_file(tmp_path, element_factory, journal):
+    filename = str(tmp_path / "model.gaphor")
+    package = element_factory.create(UML.Package)
+    package.name = "Package"
+    with open(filename, "w") as out:
+        storage.save(XMLWriter(out), element_factory)
+    journal.reset()
+    return filename
+
+
+def reload(filename, element_factory, modeling_language):
+    storage.load(filename, element_factory, modeling_language, apply_journal=True)
+
+
+def test_journal_records_attribute_change(
+    event_manager, element_factory, modeling_language, journal, model_file
+):
+    with Transaction(event_manager):
+        element_factory.lselect(UML.Package)[0].name = "Changed"
+
+    assert journal.changed
+    journal.append(model_file)
+    assert not journal.changed
+    reload(model_file, element_factory, modeling_language)
+
+    assert element_factory.lselect(UML.Package)[0].name == "Changed"
+
+
+def test_journal_records_created_and_deleted_elements(
+    event_manager, element_factory, modeling_language, journal, model_file
+):
+    with Transaction(event_manager):
+        package = element_factory.lselect(UML.Package)[0]
+        klass = element_factory.create(UML.Class)
+        klass.package = package
+
+    journal.append(model_file)
+    reload(model_file, element_factory, modeling_language)
+
+    klass = element_factory.lselect(UML.Class)[0]
+    assert klass.package is element_factory.lselect(UML.Package)[0]
+
+    with Transaction(event_manager):
+        klass.unlink()
+
+    journal.append(model_file)
+    reload(model_file, element_factory, modeling_language)
+
+    assert not element_factory.lselect(UML.Class)
+    assert not element_factory.lselect(UML.Package)[0].ownedElement
+
+
+def test_journal_is_ignored_if_model_file_changed(
+    event_manager, element_factory, modeling_language, journal, model_file
+):
+    with Transaction(event_manager):
+        element_factory.lselect(UML.Package)[0].name = "Changed"
+    journal.append(model_file)
+
+    with open(model_file, "a") as f:
+        f.write("\n")
+
+    reload(model_file, element_factory, modeling_language)
+
+    assert element_factory.lselect(UML.Package)[0].name == "Package"
+    assert not journal.can_append(model_file)
+
+
+def test_incomplete_journal_block_is_ignored(
+    event_manager, element_factory, modeling_language, journal, model_file
+):
+    package = element_factory.lselect(UML.Package)[0]
+    with Transaction(event_manager):
+        package.name = "First"
+    journal.append(model_file)
+    with Transaction(event_manager):
+        package.name = "Second"
+    journal.append(model_file)
+
+    with open(journal_filename(model_file), "rb+") as f:
+        f.truncate(f.seek(0, 2) - 2)
+
+    reload(model_file, element_factory, modeling_language)
+
+    assert element_factory.lselect(UML.Package)[0].name == "First"
+
+
+def test_journal_is_only_applied_on_request(
+    event_manager, element_factory, modeling_language, journal, model_file
+):
+    with Transaction(event_manager):
+        element_factory.lselect(UML.Package)[0].name = "Changed"
+    journal.append(model_file)
+
+    storage.load(model_file, element_factory, modeling_language)
+
+    assert element_factory.lselect(UML.Package)[0].name == "Package"
+
+
+def test_journal_for_path(
+    event_manager, element_factory, modeling_language, journal, model_file
+):
+    model_path = Path(model_file)
+    with Transaction(event_manager):
+        element_factory.lselect(UML.Package)[0].name = "Changed"
+    journal.append(model_path)
+
+    assert journal_filename(model_path) == model_file + ".journal"
+    reload(model_path, element_factory, modeling_language)
+
+    assert element_factory.lselect(UML.Package)[0].name == "Changed"
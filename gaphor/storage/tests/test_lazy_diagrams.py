@@ -0,0 +1,142 @@
+import re
+from io import StringIO
+
+from gaphor import UML
+from gaphor.application import distribution
+from gaphor.core.modeling import Diagram
+from gaphor.services.undomanager import UndoManager
+from gaphor.storage import storage
+from gaphor.storage.xmlwriter import XMLWriter
+from gaphor.transaction import Transaction
+from gaphor.UML.classes import ClassItem
+from gaphor.UML.sanitizerservice import SanitizerService
+
+
+def save(element_factory):
+    out = StringIO()
+    storage.save(XMLWriter(out), element_factory)
+    return out.getvalue()
+
+
+def load_lazy(data, element_factory, modeling_language):
+    storage.load(
+        StringIO(data),
+        factory=element_factory,
+        modeling_language=modeling_language,
+        lazy_diagrams=True,
+    )
+
+
+def model_with_class_item(element_factory):
+    diagram = element_factory.create(Diagram)
+    klass = element_factory.create(UML.Class)
+    klass.name = "Class"
+    diagram.create(ClassItem, subject=klass)
+    return save(element_factory)
+
+
+def test_diagram_items_are_loaded_on_first_access(element_factory, modeling_language):
+    data = model_with_class_item(element_factory)
+
+    load_lazy(data, element_factory, modeling_language)
+    diagram = element_factory.lselect(Diagram)[0]
+    klass = element_factory.lselect(UML.Class)[0]
+
+    assert not diagram.canvas_loaded
+    assert not klass.presentation
+
+    items = diagram.canvas.get_all_items()
+
+    assert diagram.canvas_loaded
+    assert len(items) == 1
+    assert items[0].subject is klass
+    assert klass.presentation[0] is items[0]
+
+
+def test_items_of_deleted_subjects_are_not_loaded(element_factory, modeling_language):
+    data = model_with_class_item(element_factory)
+
+    load_lazy(data, element_factory, modeling_language)
+    element_factory.lselect(UML.Class)[0].unlink()
+    diagram = element_factory.lselect(Diagram)[0]
+
+    assert not diagram.canvas_loaded
+    assert not diagram.canvas.get_all_items()
+    assert diagram.canvas_loaded
+
+
+def test_unlink_diagram_without_loading_items(
+    element_factory, modeling_language, monkeypatch
+):
+    data = model_with_class_item(element_factory)
+    loaded = []
+    monkeypatch.setattr(
+        storage, "load_canvas", lambda diagram, *args: loaded.append(diagram)
+    )
+
+    load_lazy(data, element_factory, modeling_language)
+    diagram = element_factory.lselect(Diagram)[0]
+
+    assert not diagram.canvas_loaded
+
+    diagram.unlink()
+
+    assert not element_factory.lselect(Diagram)
+    assert not loaded
+    assert not diagram.canvas.get_all_items()
+
+
+def test_loading_items_in_a_transaction_can_not_be_undone(
+    event_manager, element_factory, modeling_language
+):
+    data = model_with_class_item(element_factory)
+    load_lazy(data, element_factory, modeling_language)
+    undo_manager = UndoManager(event_manager)
+
+    try:
+        with Transaction(event_manager):
+            diagram = element_factory.lselect(Diagram)[0]
+            diagram.canvas.get_all_items()
+
+        assert not undo_manager.can_undo()
+    finally:
+        undo_manager.shutdown()
+
+
+def test_subject_shown_in_an_unloaded_diagram_is_not_deleted(
+    event_manager, element_factory, modeling_language
+):
+    klass = element_factory.create(UML.Class)
+    for _ in range(2):
+        diagram = element_factory.create(Diagram)
+        diagram.create(ClassItem, subject=klass)
+    data = save(element_factory)
+    load_lazy(data, element_factory, modeling_language)
+    sanitizer = SanitizerService(event_manager)
+
+    try:
+        first, second = element_factory.lselect(Diagram)
+        with Transaction(event_manager):
+            first.canvas.get_all_items()[0].unlink()
+
+        klass = element_factory.lselect(UML.Class)[0]
+        items = second.canvas.get_all_items()
+    finally:
+        sanitizer.shutdown()
+
+    assert not first.canvas.get_all_items()
+    assert len(items) == 1
+    assert items[0].subject is klass
+    assert klass.presentation[0] is items[0]
+
+
+def test_lazy_load_and_save_of_a_model(element_factory, modeling_language):
+    path = distribution().locate_file("test-models/simple-items.gaphor")
+    with open(path) as f:
+        orig = f.read()
+
+    load_lazy(orig, element_factory, modeling_language)
+    copy = save(element_factory)
+
+    expr = re.compile('gaphor-version="[^"]*"')
+    assert expr.sub("%VER%", copy) == expr.sub("%VER%", orig)
@@ -0,0 +1,67 @@
+from io import StringIO
+
+from gaphor.storage.parser import (
+    MIN_BLOCK_SIZE,
+    GaphorLoader,
+    ProgressGenerator,
+    parse_generator,
+)
+
+MODEL = """<?xml version="1.0" encoding="utf-8"?>
+<gaphor xmlns="http://gaphor.sourceforge.net/model" version="3.0" gaphor-version="2.0.1">
+<Comment id="c1">
+<body>
+<val>{body}</val>
+</body>
+</Comment>
+</gaphor>
+"""
+
+
+class FeedRecorder:
+    def __init__(self):
+        self.blocks = []
+
+    def feed(self, block):
+        self.blocks.append(block)
+
+
+def test_long_values_are_read_completely():
+    body = "line of text &amp; more\n" * 10000
+    loader = GaphorLoader()
+
+    for _ in parse_generator(StringIO(MODEL.format(body=body)), loader):
+        pass
+
+    assert loader.elements["c1"].values["body"] == body.replace("&amp;", "&")
+
+
+def test_progress_generator_uses_large_blocks():
+    data = "x" * (MIN_BLOCK_SIZE * 3 + 1)
+    output = FeedRecorder()
+
+    progress = list(ProgressGenerator(StringIO(data), output))
+
+    assert "".join(output.blocks) == data
+    assert len(output.blocks) == 4
+    assert progress[-1] == 100
+
+
+def test_progress_generator_block_size_scales_with_file_size():
+    data = "x" * (MIN_BLOCK_SIZE * 200)
+    output = FeedRecorder()
+
+    progress = list(ProgressGenerator(StringIO(data), output))
+
+    assert len(output.blocks) == 100
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+
+
+def test_progress_generator_with_explicit_block_size():
+    output = FeedRecorder()
+
+    progress = list(ProgressGenerator(StringIO("abcdefgh"), output, block_size=3))
+
+    assert output.blocks == ["abc", "def", "gh"]
+    assert progress[-1] == 100
@@ -11,6 +11,7 @@ log = logging.getLogger(__name__)
 
 FILTERS = [
     (gettext("All Gaphor Models"), "*.gaphor", "application/x-gaphor"),
+    (gettext("Binary Gaphor Models"), "*.gaphorb", "application/x-gaphor-binary"),
 ]
 
 
@@ -254,7 +254,7 @@ class SettingsStack:
 
     @property
     def style_sheet(self):
-        return next(self.element_factory.select(StyleSheet), None)
+        return self.element_factory.style_sheet
 
     def on_style_sheet_changed(self, buffer):
         style_sheet = self.style_sheet
@@ -2,6 +2,7 @@
 """This module has a generic file dialog functions that are used to open or
 save files."""
 
+import fnmatch
 import pathlib
 from typing import Optional, Sequence
 
@@ -9,7 +10,10 @@ from gi.repository import Gtk
 
 from gaphor.i18n import gettext
 
-GAPHOR_FILTER = [("All Gaphor Models", "*.gaphor", "application/x-gaphor")]
+GAPHOR_FILTER = [
+    ("All Gaphor Models", "*.gaphor", "application/x-gaphor"),
+    ("Binary Gaphor Models", "*.gaphorb", "application/x-gaphor-binary"),
+]
 
 
 def new_filter(name, pattern, mime_type=None):
@@ -61,7 +65,11 @@ def save_file_dialog(
         while dialog.run() == Gtk.ResponseType.ACCEPT:
             filename = dialog.get_filename()
 
-            if extension and not filename.endswith(extension):
+            if (
+                extension
+                and not filename.endswith(extension)
+                and not any(fnmatch.fnmatch(filename, p) for _, p, _ in filters)
+            ):
                 filename += extension
                 if pathlib.Path(filename).exists():
                     dialog.set_filename(filename)
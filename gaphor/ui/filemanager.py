@@ -1,13 +1,15 @@
 """The file service is responsible for loading and saving the user data."""
 
 import logging
+from typing import IO
 
 from gi.repository import Gtk
 
 from gaphor.abc import ActionProvider, Service
 from gaphor.core import action, event_handler, gettext
 from gaphor.event import SessionShutdown, SessionShutdownRequested
-from gaphor.storage import storage, verify
+from gaphor.storage import binary, storage, verify
+from gaphor.storage.journal import Journal, remove_journal
 from gaphor.storage.xmlwriter import XMLWriter
 from gaphor.ui.errorhandler import error_handler
 from gaphor.ui.event import FileLoaded, FileSaved
@@ -17,6 +19,7 @@ from gaphor.ui.questiondialog import QuestionDialog
 from gaphor.ui.statuswindow import StatusWindow
 
 DEFAULT_EXT = ".gaphor"
+BINARY_EXT = ".gaphorb"
 MAX_RECENT = 10
 
 log = logging.getLogger(__name__)
@@ -43,22 +46,47 @@ def error_message(e):
 class FileManager(Service, ActionProvider):
     """The file service, responsible for loading and saving Gaphor models."""
 
-    def __init__(self, event_manager, element_factory, modeling_language, main_window):
+    def __init__(
+        self,
+        event_manager,
+        element_factory,
+        modeling_language,
+        main_window,
+        properties=None,
+    ):
         """File manager constructor.
 
         There is no current filename yet.
+
+        If the ``incremental-save`` property is set, changes are
+        appended to a journal file on save, instead of writing the full
+        model every time.
+
+        If the ``lazy-diagrams`` property is set, diagram items are
+        created when a diagram is first used, which makes loading large
+        models faster.
         """
         self.event_manager = event_manager
         self.element_factory = element_factory
         self.modeling_language = modeling_language
         self.main_window = main_window
         self._filename = None
+        self._lazy_diagrams = bool(
+            properties and properties.get("lazy-diagrams", False)
+        )
+        self._journal = (
+            Journal(event_manager, element_factory)
+            if properties and properties.get("incremental-save", False)
+            else None
+        )
 
         event_manager.subscribe(self._on_session_shutdown_request)
 
     def shutdown(self):
         """Called when shutting down the file manager service."""
         self.event_manager.unsubscribe(self._on_session_shutdown_request)
+        if self._journal:
+            self._journal.shutdown()
 
     def get_filename(self):
         """Return the current file name.
@@ -98,7 +126,11 @@ class FileManager(Service, ActionProvider):
 
         try:
             loader = storage.load_generator(
-                filename.encode("utf-8"), self.element_factory, self.modeling_language
+                filename.encode("utf-8"),
+                self.element_factory,
+                self.modeling_language,
+                lazy_diagrams=self._lazy_diagrams,
+                apply_journal=self._journal is not None,
             )
             worker = GIdleThread(loader, queue)
 
@@ -151,13 +183,20 @@ class FileManager(Service, ActionProvider):
                 for orphan in orphans:
                     orphan.unlink()
 
-    def save(self, filename):
+    def save(self, filename, binary_format=None):
         """Save the current UML model to the specified file name.
 
         Before writing the model file, this will verify that there are
         no orphan references.  It will also verify that the filename has
         the correct extension.  A status window is displayed while the
         GIdleThread is executed.  This thread actually saves the model.
+
+        Files with a ``.gaphorb`` extension are saved in the binary
+        format, unless ``binary_format`` is set explicitly.
+
+        In incremental save mode, changes are appended to the journal of
+        the current file. Once the journal grows too big, the full model
+        is saved and the journal is removed.
         """
 
         if not (filename and len(filename)):
@@ -173,15 +212,30 @@ class FileManager(Service, ActionProvider):
             parent=main_window.window,
             queue=queue,
         )
+        if binary_format is None:
+            binary_format = filename.endswith(BINARY_EXT)
+        encoded_filename = filename.encode("utf-8")
+        journal = self._journal
         try:
-            with open(filename.encode("utf-8"), "w") as out:
-                saver = storage.save_generator(XMLWriter(out), self.element_factory)
-                worker = GIdleThread(saver, queue)
-                worker.start()
-                worker.wait()
-
-            if worker.error:
-                worker.reraise()
+            if (
+                journal
+                and filename == self.filename
+                and journal.can_append(encoded_filename)
+            ):
+                self._run_worker(journal.append_generator(encoded_filename), queue)
+            else:
+                out: IO
+                if binary_format:
+                    out = open(encoded_filename, "wb")
+                    saver = binary.save_generator(out, self.element_factory)
+                else:
+                    out = open(encoded_filename, "w")
+                    saver = storage.save_generator(XMLWriter(out), self.element_factory)
+                with out:
+                    self._run_worker(saver, queue)
+                if journal:
+                    remove_journal(encoded_filename)
+                    journal.reset()
 
             self.filename = filename
             self.event_manager.handle(FileSaved(self, filename))
@@ -197,6 +251,14 @@ class FileManager(Service, ActionProvider):
         finally:
             status_window.destroy()
 
+    def _run_worker(self, generator, queue):
+        worker = GIdleThread(generator, queue)
+        worker.start()
+        worker.wait()
+
+        if worker.error:
+            worker.reraise()
+
     @action(name="file-save", shortcut="<Primary>s")
     def action_save(self):
         """Save the file. Depending on if there is a file name, either perform
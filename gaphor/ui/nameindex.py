@@ -0,0 +1,169 @@
+"""An index for looking up model elements by (part of) their label.
+
+The label of an element is the text shown in the model browser, e.g. the
+name of a class or ``+ name: type`` for an attribute. Only elements that
+are shown in the model browser are indexed.
+
+Labels are case folded. Every substring of up to three characters of a
+label is used as a key in the index. Longer search strings are looked up
+by their trigrams, the candidates found are checked against the full
+label.
+
+The index is built on the first search, so loading a model is not slowed
+down by it.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Set
+
+from gaphor import UML
+from gaphor.core import event_handler
+from gaphor.core.format import format
+from gaphor.core.modeling import (
+    AssociationUpdated,
+    AttributeUpdated,
+    Element,
+    ElementCreated,
+    ElementDeleted,
+    ModelFlushed,
+    ModelReady,
+)
+from gaphor.ui.namespacemodel import visible
+
+if TYPE_CHECKING:
+    from gaphor.core.eventmanager import EventManager
+    from gaphor.core.modeling import ElementFactory
+
+GRAM_SIZE = 3
+
+# Properties of elements whose label contains the name of the referenced
+# element, e.g. the type of an attribute.
+NAME_REFERENCES = (
+    (UML.Property, "type"),
+    (UML.Generalization, "general"),
+    (UML.Dependency, "supplier"),
+    (UML.Extend, "extendedCase"),
+    (UML.Include, "addition"),
+)
+
+
+def grams(label: str) -> Iterator[str]:
+    """All substrings of ``label`` of up to ``GRAM_SIZE`` characters."""
+    for size in range(1, GRAM_SIZE + 1):
+        for start in range(len(label) - size + 1):
+            end = start + size
+            yield label[start:end]
+
+
+class NameIndex:
+    def __init__(self, event_manager: EventManager, element_factory: ElementFactory):
+        self.event_manager = event_manager
+        self.element_factory = element_factory
+        self.version = 0
+        self._labels: Dict[Element, str] = {}
+        self._grams: Optional[Dict[str, Set[Element]]] = None
+
+        event_manager.subscribe(self.refresh)
+        event_manager.subscribe(self._on_element_create)
+        event_manager.subscribe(self._on_element_delete)
+        event_manager.subscribe(self._on_element_update)
+
+    def shutdown(self):
+        em = self.event_manager
+        em.unsubscribe(self.refresh)
+        em.unsubscribe(self._on_element_create)
+        em.unsubscribe(self._on_element_delete)
+        em.unsubscribe(self._on_element_update)
+
+    def search(self, text: str) -> Set[Element]:
+        """Find all elements whose label contains ``text``, ignoring
+        case."""
+        key = text.casefold()
+        if not key:
+            return set()
+        if self._grams is None:
+            self._build()
+        assert self._grams is not None
+        if len(key) <= GRAM_SIZE:
+            return set(self._grams.get(key, ()))
+
+        # Every trigram of key is part of a matching label, hence checking
+        # the elements for the least common trigram is enough.
+        candidates = min(
+            (
+                self._grams.get(gram, ())
+                for gram in grams(key)
+                if len(gram) == GRAM_SIZE
+            ),
+            key=len,
+        )
+        labels = self._labels
+        return {e for e in candidates if key in labels[e]}
+
+    def label(self, element: Element) -> str:
+        """The (case folded) label ``element`` is indexed by."""
+        return self._labels.get(element, "")
+
+    def _build(self):
+        self._grams = {}
+        for element in self.element_factory.select(visible):
+            self._add(element)
+
+    def _add(self, element):
+        if self._grams is None or not visible(element):
+            return
+        label = format(element).casefold()
+        if label:
+            self._labels[element] = label
+            for gram in set(grams(label)):
+                self._grams.setdefault(gram, set()).add(element)
+            self.version += 1
+
+    def _remove(self, element):
+        label = self._labels.pop(element, None)
+        if label is None or self._grams is None:
+            return
+        for gram in set(grams(label)):
+            elements = self._grams[gram]
+            elements.discard(element)
+            if not elements:
+                del self._grams[gram]
+        self.version += 1
+
+    def _update(self, element):
+        if self._grams is not None:
+            self._remove(element)
+            self._add(element)
+
+    @event_handler(ModelReady, ModelFlushed)
+    def refresh(self, event=None):
+        """Drop the index, it is rebuilt on the next search."""
+        self._labels.clear()
+        self._grams = None
+        self.version += 1
+
+    @event_handler(ElementCreated)
+    def _on_element_create(self, event: ElementCreated):
+        self._add(event.element)
+
+    @event_handler(ElementDeleted)
+    def _on_element_delete(self, event: ElementDeleted):
+        self._remove(event.element)
+
+    @event_handler(AttributeUpdated, AssociationUpdated)
+    def _on_element_update(self, event):
+        if self._grams is None:
+            return
+        element = event.element
+        self._update(element)
+
+        # Parameters are shown as part of their operation
+        if isinstance(element, UML.Parameter) and element.owner:
+            self._update(element.owner)
+
+        if event.property is UML.NamedElement.name:
+            query = self.element_factory.query
+            for type, name in NAME_REFERENCES:
+                for other in query(type, **{name: element}):
+                    self._update(other)
@@ -7,18 +7,21 @@ classifiers are shown here.
 
 from __future__ import annotations
 
+import heapq
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
 
 from gi.repository import Gdk, Gio, GLib, Gtk
 
 from gaphor import UML
+from gaphor.abc import ActionProvider
 from gaphor.core import action, event_handler, gettext, transactional
 from gaphor.core.format import format
-from gaphor.core.modeling import Diagram, Presentation
+from gaphor.core.modeling import Diagram, Element, Presentation
 from gaphor.ui.abc import UIComponent
 from gaphor.ui.actiongroup import create_action_group
 from gaphor.ui.event import DiagramOpened, DiagramSelectionChanged
+from gaphor.ui.nameindex import NameIndex
 from gaphor.ui.namespacemodel import (
     RELATIONSHIPS,
     NamespaceModel,
@@ -33,6 +36,9 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# Maximum number of elements shown by quick find
+QUICK_FIND_LIMIT = 30
+
 
 def popup_model(view):
     model = Gio.Menu.new()
@@ -73,16 +79,19 @@ def popup_model(view):
     return model
 
 
-class Namespace(UIComponent):
+class Namespace(UIComponent, ActionProvider):
     def __init__(self, event_manager: EventManager, element_factory: ElementFactory):
         self.event_manager = event_manager
         self.element_factory = element_factory
 
         self.model: Optional[NamespaceModel] = None
         self.view: Optional[NamespaceView] = None
+        self.name_index: Optional[NameIndex] = None
+        self._search_results: Tuple[object, Set, Set] = (None, set(), set())
 
     def open(self):
         self.model = NamespaceModel(self.event_manager, self.element_factory)
+        self.name_index = NameIndex(self.event_manager, self.element_factory)
         self.event_manager.subscribe(self._on_model_refreshed)
         self.event_manager.subscribe(self._on_diagram_selection_changed)
 
@@ -91,24 +100,23 @@ class Namespace(UIComponent):
         def search_func(model, column, key, rowiter):
             # Note that this function returns `False` for a match!
             assert column == 0
-            row = model[rowiter]
-            matched = False
-
-            # Search in child rows.  If any element in the underlying
-            # tree matches, it will expand.
-            for inner in row.iterchildren():
-                if not search_func(model, column, key, inner.iter):
-                    view.expand_to_path(row.path)
-                    matched = True
-
-            element = list(row)[column]
-            s = format(element)
-            if s and key.lower() in s.lower():
-                matched = True
-            elif not matched:
-                view.collapse_row(row.path)
-
-            return not matched  # False means match found!
+            element = model.get_value(rowiter, 0)
+            if element is RELATIONSHIPS:
+                parent_iter = model.iter_parent(rowiter)
+                element = (
+                    RELATIONSHIPS,
+                    parent_iter and model.get_value(parent_iter, 0),
+                )
+            matches, owners = self.search(key)
+
+            # Expand rows that contain a match, so it can be found.
+            path = model.get_path(rowiter)
+            if element in owners:
+                view.expand_row(path, False)
+            elif element not in matches:
+                view.collapse_row(path)
+
+            return element not in matches  # False means match found!
 
         view = NamespaceView(sorted_model, self.element_factory)
         view.set_search_equal_func(search_func)
@@ -123,6 +131,7 @@ class Namespace(UIComponent):
             "tree-view", create_action_group(self, "tree-view")[0]
         )
         view.connect_after("event-after", self._on_view_event)
+        view.connect("test-expand-row", self._on_view_test_expand_row)
         view.connect("row-activated", self._on_view_row_activated)
         view.connect_after("cursor-changed", self._on_view_cursor_changed)
         view.connect("destroy", self._on_view_destroyed)
@@ -138,6 +147,9 @@ class Namespace(UIComponent):
         if self.model:
             self.model.shutdown()
             self.model = None
+        if self.name_index:
+            self.name_index.shutdown()
+            self.name_index = None
         self.event_manager.unsubscribe(self._on_model_refreshed)
         self.event_manager.unsubscribe(self._on_diagram_selection_changed)
 
@@ -163,6 +175,12 @@ class Namespace(UIComponent):
         elif event.type == Gdk.EventType.KEY_PRESS and event.key.keyval == Gdk.KEY_F2:
             self.tree_view_rename_selected()
 
+    def _on_view_test_expand_row(self, view, iter, path):
+        """Load child rows before a row is expanded."""
+        assert self.model
+        self.model.load_children(view.get_model().convert_iter_to_child_iter(iter))
+        return False
+
     def _on_view_row_activated(self, view, path, column):
         """Double click on an element in the tree view."""
         view.get_action_group("tree-view").lookup_action("open").activate()
@@ -191,6 +209,27 @@ class Namespace(UIComponent):
     def _on_view_destroyed(self, widget):
         self.close()
 
+    def search(self, text: str) -> Tuple[Set, Set]:
+        """Find elements by (part of) the label shown in the tree view.
+
+        Returns the matching elements and the elements containing them.
+        Relationships are contained by a ``(RELATIONSHIPS, owner)`` pair.
+        """
+        assert self.name_index
+        key = (text, self.name_index.version)
+        if self._search_results[0] != key:
+            matches = self.name_index.search(text)
+            owners: Set = set()
+            for element in matches:
+                if isinstance(element, UML.Relationship):
+                    owners.add((RELATIONSHIPS, element.owner))
+                owner = element.owner
+                while owner is not None and owner not in owners:
+                    owners.add(owner)
+                    owner = owner.owner
+            self._search_results = (key, matches, owners)
+        return self._search_results[1], self._search_results[2]
+
     def select_element(self, element):
         """Select an element from the Namespace view.
 
@@ -202,22 +241,70 @@ class Namespace(UIComponent):
         assert self.view
 
         model = self.view.get_model()
-        child_iter = self.model.iter_for_element(element)
+        child_iter = self.model.expand_to_element(element)
         ok, tree_iter = model.convert_child_iter_to_iter(child_iter)
         assert ok, "Could not convert model iterator to view"
         path = model.get_path(tree_iter)
         path_indices = path.get_indices()
 
-        # Expand the parent row
+        # Expand the parent rows
         if len(path_indices) > 1:
             parent_path = Gtk.TreePath.new_from_indices(path_indices[:-1])
-            self.view.expand_row(path=parent_path, open_all=False)
+            self.view.expand_to_path(parent_path)
 
         selection = self.view.get_selection()
         selection.select_path(path)
         self.view.scroll_to_cell(path, None, False, 0, 0)
         self._on_view_cursor_changed(self.view)
 
+    @action(name="quick-find", shortcut="<Primary>f")
+    def quick_find(self):
+        """Find an element by its label and select it in the tree view."""
+        if not self.view:
+            return
+
+        found: List[Element] = []
+        entry = Gtk.SearchEntry.new()
+        list_box = Gtk.ListBox.new()
+        box = Gtk.Box.new(Gtk.Orientation.VERTICAL, 6)
+        box.pack_start(entry, False, False, 0)
+        box.pack_start(list_box, True, True, 0)
+        popover = Gtk.Popover.new()
+        popover.add(box)
+        popover.set_relative_to(self.view)
+
+        def on_search_changed(entry):
+            for row in list_box.get_children():
+                row.destroy()
+            matches, _owners = self.search(entry.get_text())
+            assert self.name_index
+            indexed_label = self.name_index.label
+            found[:] = heapq.nsmallest(
+                QUICK_FIND_LIMIT, matches, key=lambda e: len(indexed_label(e))
+            )
+            for element in found:
+                label = Gtk.Label.new(format(element))
+                label.set_xalign(0)
+                list_box.add(label)
+            list_box.show_all()
+
+        def jump_to(element):
+            popover.popdown()
+            assert self.model and self.view
+            if self.model.expand_to_element(element) is not None:
+                self.select_element(element)
+                self.view.grab_focus()
+
+        entry.connect("search-changed", on_search_changed)
+        entry.connect("activate", lambda entry: found and jump_to(found[0]))
+        list_box.connect(
+            "row-activated", lambda list_box, row: jump_to(found[row.get_index()])
+        )
+        popover.connect("closed", lambda popover: popover.destroy())
+        box.show_all()
+        popover.popup()
+        entry.grab_focus()
+
     @action(name="tree-view.open")
     def tree_view_open_selected(self):
         assert self.view
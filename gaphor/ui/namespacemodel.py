@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
 
 from gi.repository import Gtk
 
@@ -30,17 +30,18 @@ class RELATIONSHIPS:
     owner = None
 
 
-def relationship_iter(model, iter):
-    if iter is None or isinstance(model.get_value(iter, 0), UML.Package):
-        child_iter = model.iter_children(iter)
-        while child_iter:
-            maybe_relationships = model.get_value(child_iter, 0)
-            if maybe_relationships is RELATIONSHIPS:
-                return child_iter
-            child_iter = model.iter_next(child_iter)
-        return model.append(iter, [RELATIONSHIPS])
-    else:
-        return iter
+class PLACEHOLDER:
+    """Child row of elements of which the children have not been loaded."""
+
+    name = ""
+    owner = None
+
+
+def visible(element) -> bool:
+    """Check if an element is shown in the model browser."""
+    return isinstance(element, (UML.Relationship, UML.NamedElement)) and not isinstance(
+        element, (UML.InstanceSpecification, UML.OccurrenceSpecification)
+    )
 
 
 def relationship_iter_parent(model, iter):
@@ -60,6 +61,17 @@ class NamespaceModel:
         self.element_factory = element_factory
         self.model = Gtk.TreeStore.new([object])
 
+        # Row references for elements and for RELATIONSHIPS pseudo-nodes
+        # (by parent element), so rows can be found without scanning.
+        self._rows: Dict[object, Gtk.TreeRowReference] = {}
+        self._relationship_rows: Dict[object, Gtk.TreeRowReference] = {}
+
+        # Elements of which the child rows are loaded. Other elements
+        # with children only have a PLACEHOLDER row.
+        self._loaded: Set[object] = set()
+
+        self._sort_keys: Dict[object, Tuple[int, str]] = {}
+
         event_manager.subscribe(self.refresh)
         event_manager.subscribe(self._on_element_create)
         event_manager.subscribe(self._on_element_delete)
@@ -79,28 +91,27 @@ class NamespaceModel:
         sorted_model = Gtk.TreeModelSort(model=self.model)
 
         def sort_func(model, iter_a, iter_b, userdata):
-            va = model.get_value(iter_a, 0)
-            vb = model.get_value(iter_b, 0)
-
-            # Put Relationships pseudo-node at top
-            if va is RELATIONSHIPS:
-                return -1
-            if vb is RELATIONSHIPS:
-                return 1
-
-            a = (format(va) or "").lower()
-            b = (format(vb) or "").lower()
-            if a == b:
-                return 0
-            if a > b:
-                return 1
-            return -1
+            a = self.sort_key(model.get_value(iter_a, 0))
+            b = self.sort_key(model.get_value(iter_b, 0))
+            return (a > b) - (a < b)
 
         sorted_model.set_sort_func(0, sort_func, None)
         sorted_model.set_sort_column_id(0, Gtk.SortType.ASCENDING)
 
         return sorted_model
 
+    def sort_key(self, element):
+        """The key used to sort rows, cached per element."""
+        try:
+            return self._sort_keys[element]
+        except KeyError:
+            pass
+        # Put Relationships pseudo-node at top
+        if element is RELATIONSHIPS or element is PLACEHOLDER:
+            return (0, "")
+        key = self._sort_keys[element] = (1, (format(element) or "").lower())
+        return key
+
     def iter_children(self, iter):
         return self.model.iter_children(iter)
 
@@ -110,76 +121,142 @@ class NamespaceModel:
     def get_element(self, iter):
         return self.model.get_value(iter, 0)
 
-    def iter_for_element(self, element, old_owner=0):
+    def iter_for_element(self, element):
         """Get the Gtk.TreeIter for an element in the Namespace.
 
         Args:
             element: The element contained in the Namespace.
-            old_owner: The old owner containing the element, optional.
 
         Returns: Gtk.TreeIter object of the model (not the sorted one!)
         """
-
-        # Using `0` as sentinel
-        if old_owner != 0:
-            parent_iter = self.iter_for_element(old_owner)
-        elif element and element.owner:
-            parent_iter = self.iter_for_element(element.owner)
-        else:
-            parent_iter = None
-
-        if isinstance(element, UML.Relationship):
-            parent_iter = relationship_iter(self.model, parent_iter)
-
-        child_iter = self.model.iter_children(parent_iter)
-        while child_iter:
-            if self.model.get_value(child_iter, 0) is element:
-                return child_iter
-            child_iter = self.model.iter_next(child_iter)
-        return None
-
-    def _visible(self, element):
-        return isinstance(
-            element, (UML.Relationship, UML.NamedElement)
-        ) and not isinstance(
-            element, (UML.InstanceSpecification, UML.OccurrenceSpecification)
-        )
+        return self._iter_for_reference(self._rows.get(element))
+
+    def _iter_for_reference(self, reference: Optional[Gtk.TreeRowReference]):
+        if reference is None or not reference.valid():
+            return None
+        return self.model.get_iter(reference.get_path())
+
+    def _reference(self, iter):
+        return Gtk.TreeRowReference.new(self.model, self.model.get_path(iter))
+
+    def _relationship_iter(self, iter):
+        """Get (or create) the RELATIONSHIPS pseudo-node for a package or
+        the root, other parents contain relationships directly."""
+        parent = None if iter is None else self.model.get_value(iter, 0)
+        if parent is not None and not isinstance(parent, UML.Package):
+            return iter
+        rel_iter = self._iter_for_reference(self._relationship_rows.get(parent))
+        if rel_iter is None:
+            rel_iter = self.model.append(iter, [RELATIONSHIPS])
+            self._relationship_rows[parent] = self._reference(rel_iter)
+        return rel_iter
 
     def _add(self, element, iter=None):
-        if self._visible(element):
+        if visible(element):
             if isinstance(element, UML.Relationship):
-                iter = relationship_iter(self.model, iter)
+                iter = self._relationship_iter(iter)
             child_iter = self.model.append(iter, [element])
-            for e in element.ownedElement:
-                # check if owned element is indeed within parent's owner
-                # This is important since we should be able to traverse this relation both ways
-                if element is e.owner:
-                    self._add(e, child_iter)
+            self._rows[element] = self._reference(child_iter)
+            if any(self._owned_elements(element)):
+                self.model.append(child_iter, [PLACEHOLDER])
+            else:
+                self._loaded.add(element)
+
+    def _owned_elements(self, element):
+        for e in element.ownedElement:
+            # check if owned element is indeed within parent's owner
+            # This is important since we should be able to traverse this relation both ways
+            if element is e.owner and visible(e):
+                yield e
+
+    def _mark_stale(self, iter):
+        """Child rows of ``iter`` are not loaded, make sure it can be
+        expanded."""
+        if not self.model.iter_has_child(iter):
+            self.model.append(iter, [PLACEHOLDER])
+
+    def load_children(self, iter):
+        """Add the child rows of an element, if that has not been done
+        yet.
+
+        Rows are added before the placeholder is removed, so the row
+        stays expandable.
+        """
+        element = self.model.get_value(iter, 0)
+        if (
+            element is RELATIONSHIPS
+            or element is PLACEHOLDER
+            or element in self._loaded
+        ):
+            return
+        placeholder_iter = self.model.iter_children(iter)
+        self._loaded.add(element)
+        for e in self._owned_elements(element):
+            self._add(e, iter)
+        if placeholder_iter:
+            self.model.remove(placeholder_iter)
+
+    def expand_to_element(self, element):
+        """Get the Gtk.TreeIter for an element, loading the rows of its
+        owners if needed."""
+        iter = self.iter_for_element(element)
+        if iter is None and element is not None and element.owner:
+            owner_iter = self.expand_to_element(element.owner)
+            if owner_iter:
+                self.load_children(owner_iter)
+                iter = self.iter_for_element(element)
+        return iter
+
+    def _forget(self, iter):
+        """Drop the row references of a row and its children."""
+        element = self.model.get_value(iter, 0)
+        if element is RELATIONSHIPS:
+            parent_iter = self.model.iter_parent(iter)
+            self._relationship_rows.pop(
+                None if parent_iter is None else self.model.get_value(parent_iter, 0),
+                None,
+            )
+        else:
+            self._rows.pop(element, None)
+            self._loaded.discard(element)
+            self._sort_keys.pop(element, None)
+        child_iter = self.model.iter_children(iter)
+        while child_iter:
+            self._forget(child_iter)
+            child_iter = self.model.iter_next(child_iter)
 
     def _remove(self, iter):
         if iter:
             parent_iter = self.model.iter_parent(iter)
+            self._forget(iter)
             self.model.remove(iter)
             if (
                 parent_iter
                 and not self.model.iter_has_child(parent_iter)
                 and self.model.get_value(parent_iter, 0) is RELATIONSHIPS
             ):
+                self._forget(parent_iter)
                 self.model.remove(parent_iter)
 
     @event_handler(ModelReady, ModelFlushed)
     def refresh(self, event=None):
-        """Load a new model completely."""
+        """Load a new model.
+
+        Only top-level elements are added. Child rows are loaded when
+        needed, through ``load_children()``.
+        """
         log.info("Rebuilding namespace model")
 
+        self._rows.clear()
+        self._relationship_rows.clear()
+        self._loaded.clear()
+        self._sort_keys.clear()
         self.model.clear()
 
-        toplevel = self.element_factory.select(
-            lambda e: self._visible(e) and not e.owner
-        )
+        toplevel = self.element_factory.select(lambda e: visible(e) and not e.owner)
 
         for element in toplevel:
-            if self._visible(element):
+            if visible(element):
                 self._add(element)
 
         self.event_manager.handle(NamespaceModelRefreshed(self))
@@ -187,9 +264,16 @@ class NamespaceModel:
     @event_handler(ElementCreated)
     def _on_element_create(self, event: ElementCreated):
         element = event.element
-        if self._visible(element) and not self.iter_for_element(element):
-            iter = self.iter_for_element(element.owner)
-            self._add(element, iter)
+        if visible(element) and not self.iter_for_element(element):
+            owner = element.owner
+            iter = self.iter_for_element(owner)
+            if iter is None and owner and visible(owner):
+                # The owner's row has not been loaded yet
+                return
+            if iter is None or owner in self._loaded:
+                self._add(element, iter)
+            else:
+                self._mark_stale(iter)
 
     @event_handler(ElementDeleted)
     def _on_element_delete(self, event: ElementDeleted):
@@ -201,17 +285,20 @@ class NamespaceModel:
     def _on_association_set(self, event: DerivedSet):
         if event.property is not UML.Element.owner:
             return
-        old_value, new_value = event.old_value, event.new_value
+        new_value = event.new_value
 
         element = event.element
-        old_iter = self.iter_for_element(element, old_owner=old_value)
+        old_iter = self.iter_for_element(element)
         self._remove(old_iter)
 
-        if self._visible(element):
+        if visible(element):
             new_iter = self.iter_for_element(new_value)
             # Should be either set (sub node) or unset (root node)
             if bool(new_iter) == bool(new_value):
-                self._add(element, new_iter)
+                if new_value is None or new_value in self._loaded:
+                    self._add(element, new_iter)
+                else:
+                    self._mark_stale(new_iter)
 
     @event_handler(AttributeUpdated)
     def _on_attribute_change(self, event: AttributeUpdated):
@@ -222,6 +309,7 @@ class NamespaceModel:
             or event.property is UML.NamedElement.name
         ):
             element = event.element
+            self._sort_keys.pop(element, None)
 
             iter = self.iter_for_element(element)
             if iter:
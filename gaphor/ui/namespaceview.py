@@ -10,7 +10,11 @@ from gaphor.core import gettext, transactional
 from gaphor.core.format import format, parse
 from gaphor.core.modeling import Diagram
 from gaphor.ui.iconname import get_icon_name
-from gaphor.ui.namespacemodel import RELATIONSHIPS, relationship_iter_parent
+from gaphor.ui.namespacemodel import (
+    PLACEHOLDER,
+    RELATIONSHIPS,
+    relationship_iter_parent,
+)
 
 log = logging.getLogger(__name__)
 
@@ -77,7 +81,7 @@ class NamespaceView(Gtk.TreeView):
     def _set_pixbuf(self, column, cell, model, iter, data):
         element = model.get_value(iter, 0)
 
-        if element is RELATIONSHIPS:
+        if element is RELATIONSHIPS or element is PLACEHOLDER:
             cell.set_property("icon-name", None)
             cell.set_property("visible", False)
         elif isinstance(element, (UML.Property, UML.Operation)):
@@ -109,6 +113,8 @@ class NamespaceView(Gtk.TreeView):
 
         if element is RELATIONSHIPS:
             text = gettext("<Relationships>")
+        elif element is PLACEHOLDER:
+            text = ""
         else:
             text = format(element) or "<None>"
         cell.set_property("text", text)
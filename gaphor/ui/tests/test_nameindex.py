@@ -0,0 +1,121 @@
+import pytest
+
+from gaphor import UML
+from gaphor.ui.nameindex import NameIndex
+
+
+@pytest.fixture
+def name_index(event_manager, element_factory):
+    name_index = NameIndex(event_manager, element_factory)
+    yield name_index
+    name_index.shutdown()
+
+
+def test_find_element_by_part_of_its_name(name_index, element_factory):
+    klass = element_factory.create(UML.Class)
+    klass.name = "CustomerOrder"
+    element_factory.create(UML.Class).name = "Invoice"
+
+    assert name_index.search("order") == {klass}
+    assert name_index.search("TOMERORD") == {klass}
+    assert name_index.search("ord") == {klass}
+    assert name_index.search("u") == {klass}
+
+
+def test_search_for_long_text_checks_full_name(name_index, element_factory):
+    element_factory.create(UML.Class).name = "abcd bcde"
+
+    assert not name_index.search("abcde")
+
+
+def test_renamed_element(name_index, element_factory):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Foo"
+    klass.name = "Bar"
+
+    assert not name_index.search("foo")
+    assert name_index.search("bar") == {klass}
+
+
+def test_deleted_element(name_index, element_factory):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Foo"
+
+    klass.unlink()
+
+    assert not name_index.search("foo")
+
+
+def test_index_is_rebuilt_on_model_ready(name_index, element_factory):
+    with element_factory.block_events():
+        klass = element_factory.create(UML.Class)
+        klass.name = "Foo"
+    element_factory.model_ready()
+
+    assert name_index.search("foo") == {klass}
+
+    element_factory.flush()
+
+    assert not name_index.search("foo")
+
+
+def test_find_attribute_by_its_type(name_index, element_factory):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Customer"
+    attribute = element_factory.create(UML.Property)
+    attribute.name = "owner"
+    attribute.type = klass
+
+    assert name_index.search("owner: cust") == {attribute}
+    assert name_index.search("customer") == {klass, attribute}
+
+
+def test_label_is_updated_when_referenced_element_is_renamed(
+    name_index, element_factory
+):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Customer"
+    attribute = element_factory.create(UML.Property)
+    attribute.name = "owner"
+    attribute.type = klass
+    assert name_index.search("customer") == {klass, attribute}
+
+    klass.name = "Client"
+
+    assert not name_index.search("customer")
+    assert name_index.search("client") == {klass, attribute}
+
+
+def test_relationship_is_updated_when_referenced_element_is_renamed(
+    name_index, element_factory, monkeypatch
+):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Base"
+    generalization = element_factory.create(UML.Generalization)
+    generalization.general = klass
+    other = element_factory.create(UML.Class)
+    other.name = "Base class"
+    assert name_index.search("base") == {klass, generalization, other}
+
+    monkeypatch.setattr(name_index, "search", None)
+    klass.name = "Root"
+    monkeypatch.undo()
+
+    assert name_index.search("base") == {other}
+    assert name_index.search("general: root") == {generalization}
+
+
+def test_find_relationship(name_index, element_factory):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Base"
+    generalization = element_factory.create(UML.Generalization)
+    generalization.general = klass
+
+    assert name_index.search("general: base") == {generalization}
+
+
+def test_elements_not_in_the_model_browser_are_not_found(name_index, element_factory):
+    element_factory.create(UML.InstanceSpecification).name = "Foo"
+    element_factory.create(UML.OccurrenceSpecification).name = "Foo"
+
+    assert not name_index.search("foo")
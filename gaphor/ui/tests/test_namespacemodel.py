@@ -3,7 +3,7 @@ import pytest
 import gaphor.core.eventmanager
 from gaphor import UML
 from gaphor.core.modeling import ElementFactory
-from gaphor.ui.namespacemodel import RELATIONSHIPS, NamespaceModel
+from gaphor.ui.namespacemodel import PLACEHOLDER, RELATIONSHIPS, NamespaceModel
 
 
 @pytest.fixture
@@ -166,3 +166,103 @@ def test_relationship__in_non_package_element(namespace, element_factory):
     assert namespace.iter_n_children(None) == 1
     assert namespace.iter_n_children(iter) == 1
     assert namespace.iter_for_element(g)
+
+
+def test_element_is_found_after_move(namespace, element_factory):
+    p1 = element_factory.create(UML.Package)
+    p2 = element_factory.create(UML.Package)
+    cls = element_factory.create(UML.Class)
+    cls.package = p1
+
+    cls.package = p2
+
+    iter = namespace.iter_for_element(cls)
+    assert namespace.get_element(iter) is cls
+    assert namespace.get_element(namespace.model.iter_parent(iter)) is p2
+    assert namespace.iter_n_children(namespace.iter_for_element(p1)) == 0
+
+
+def test_children_of_deleted_element_are_forgotten(namespace, element_factory):
+    pkg = element_factory.create(UML.Package)
+    cls = element_factory.create(UML.Class)
+    cls.package = pkg
+
+    pkg.unlink()
+
+    assert namespace.iter_for_element(pkg) is None
+    assert namespace.iter_for_element(cls) is None
+
+
+def test_relationships_node_is_recreated(namespace, element_factory):
+    a = element_factory.create(UML.Association)
+    a.unlink()
+
+    assert namespace.iter_n_children(None) == 0
+
+    a = element_factory.create(UML.Association)
+    iter = namespace.iter_for_element(a)
+
+    assert namespace.get_element(namespace.model.iter_parent(iter)) is RELATIONSHIPS
+    assert namespace.iter_n_children(None) == 1
+
+
+def model_with_nested_packages(element_factory):
+    with element_factory.block_events():
+        p1 = element_factory.create(UML.Package)
+        p2 = element_factory.create(UML.Package)
+        cls = element_factory.create(UML.Class)
+        p2.package = p1
+        cls.package = p2
+    element_factory.model_ready()
+    return p1, p2, cls
+
+
+def test_child_rows_are_loaded_on_demand(namespace, element_factory):
+    p1, p2, cls = model_with_nested_packages(element_factory)
+
+    iter = namespace.iter_for_element(p1)
+
+    assert namespace.get_element(namespace.iter_children(iter)) is PLACEHOLDER
+    assert namespace.iter_for_element(p2) is None
+
+    namespace.load_children(iter)
+
+    assert namespace.iter_n_children(iter) == 1
+    assert namespace.get_element(namespace.iter_children(iter)) is p2
+    assert namespace.iter_for_element(cls) is None
+
+
+def test_expand_to_element(namespace, element_factory):
+    p1, p2, cls = model_with_nested_packages(element_factory)
+
+    iter = namespace.expand_to_element(cls)
+
+    assert namespace.get_element(iter) is cls
+    assert namespace.iter_for_element(p2)
+
+
+def test_new_element_in_unloaded_package(namespace, element_factory):
+    p1, p2, cls = model_with_nested_packages(element_factory)
+
+    package = element_factory.create(UML.Package)
+    package.package = p2
+
+    assert namespace.iter_for_element(package) is None
+
+    iter = namespace.expand_to_element(p2)
+    namespace.load_children(iter)
+
+    assert namespace.iter_n_children(iter) == 2
+    assert namespace.iter_for_element(package)
+
+
+def test_sort_key_is_updated_on_rename(namespace, element_factory):
+    p1 = element_factory.create(UML.Package)
+    p1.name = "Bar"
+
+    assert namespace.sort_key(p1) == (1, "bar")
+    assert namespace.sort_key(RELATIONSHIPS) < namespace.sort_key(p1)
+
+    p1.name = "Foo"
+
+    assert namespace.sort_key(p1) == (1, "foo")
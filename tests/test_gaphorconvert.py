@@ -14,6 +14,7 @@ def test_help_output(capsys):
     assert "--dir=directory" in captured.out
     assert "--format=format" in captured.out
     assert "--regex=regex" in captured.out
+    assert "--jobs=jobs" in captured.out
 
 
 def test_export_pdf(tmp_path):
@@ -45,3 +46,14 @@ def test_export_svg(tmp_path):
 
     assert model_path.exists()
     assert (model_path / "main.svg").exists()
+
+
+def test_export_with_multiple_processes(tmp_path):
+    exit_code = gaphorconvert.main(
+        ["-j", "2", "-f", "svg", "-d", str(tmp_path), "examples/all-elements.gaphor"]
+    )
+
+    model_path = tmp_path / "New model"
+
+    assert exit_code == 0
+    assert (model_path / "main.svg").exists()